@@ -0,0 +1,264 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks.synthetic import dataset_dir
+
+# Micro-benchmarks of the filter stage and chart builders of src/app.py.
+#
+# For every dataset size, a child process loads the app on a synthetic
+# snapshot of that size (the app loads its data at import) and times, for a
+# matrix of filter scenarios, the filter stage, every chart builder and the
+# whole main_callback with the result cache disabled. Each stage records its
+# run times and the size in bytes of what it sends to the browser.
+#
+#   python -m benchmarks.charts --sizes 10000 100000 1000000 --out charts.json
+#
+# Compare two result files with benchmarks/compare.py.
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+SIZES = [10000, 100000, 1000000]
+
+
+def scenarios(app):
+    """Filter combinations to benchmark, as main_callback filter arguments."""
+    neighbourhoods = list(app.raw_trees["NEIGHBOURHOOD_NAME"].cat.categories)
+    cultivars = list(app.raw_trees["CULTIVAR_NAME"].cat.categories)
+    lat = float(np.nanmedian(app.raw_trees["lat"]))
+    lon = float(np.nanmedian(app.raw_trees["lon"]))
+    box = [[lon - 0.02, lat - 0.01], [lon + 0.02, lat + 0.01]]
+    lasso = [[lon - 0.02, lat - 0.01], [lon + 0.02, lat - 0.01], [lon, lat + 0.01]]
+    return {
+        "default": {},
+        "dates": {"start_date": "2022-04-01", "end_date": "2022-04-15"},
+        "neighbourhood": {"neighbourhood": neighbourhoods[:1]},
+        "neighbourhoods": {"neighbourhood": neighbourhoods[:3]},
+        "cultivars": {"cultivar": cultivars[:2]},
+        "diameter": {"diameter_range": [20, 60]},
+        "box": {"map_selection": {"range": box}},
+        "lasso": {"map_selection": {"lasso": lasso}},
+        "near": {"near": [1000, lat, lon]},
+        "combined": {
+            "start_date": "2022-03-15",
+            "end_date": "2022-04-30",
+            "neighbourhood": neighbourhoods[:3],
+            "cultivar": cultivars[:4],
+            "diameter_range": [10, 80],
+        },
+    }
+
+
+def filters(scenario):
+    args = {
+        "start_date": None,
+        "end_date": None,
+        "neighbourhood": None,
+        "cultivar": None,
+        "diameter_range": [0, 100],
+        "map_selection": None,
+        "near": None,
+    }
+    args.update(scenario)
+    return args
+
+
+def payload_bytes(output):
+    if isinstance(output, str):
+        return len(output.encode())
+    return len(output.to_json().encode())
+
+
+def timed(fn, repeat):
+    """Run `fn` once to warm up, then `repeat` times; returns (runs, result)."""
+    result = fn()
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - start)
+    return runs, result
+
+
+def summary(runs, output=None):
+    return {
+        "runs_s": runs,
+        "min_s": min(runs),
+        "median_s": statistics.median(runs),
+        "bytes": None if output is None else payload_bytes(output),
+    }
+
+
+def run_worker(repeat, only=None):
+    """Benchmark the app loaded from CHERRY_DATA_DIR; returns result rows."""
+    import src.app as app
+
+    results = []
+    for name, scenario in scenarios(app).items():
+        if only and name not in only:
+            continue
+        args = filters(scenario)
+        start_date, end_date = app.parse_dates(args["start_date"], args["end_date"])
+        stages = {}
+
+        def filter_rows():
+            return app.filter_trees(
+                start_date,
+                end_date,
+                args["neighbourhood"],
+                args["cultivar"],
+                args["diameter_range"],
+                args["map_selection"],
+                args["near"],
+            )
+
+        runs, rows = timed(filter_rows, repeat)
+        stages["filter"] = summary(runs)
+        runs, trees = timed(lambda: app.raw_trees.take(rows), repeat)
+        stages["take"] = summary(runs)
+
+        for chart in ["bar", "timeline", "diameter", "density"]:
+            builder = app.CHART_BUILDERS[chart]
+
+            def build():
+                # the diameter curve is memoized per worker, measure it cold
+                app.cached_diameter_density.cache_clear()
+                return builder(trees.copy())
+
+            runs, output = timed(build, repeat)
+            stages[chart] = summary(runs, output)
+
+        # the map as main_callback draws it at the default zoom, including
+        # the JSON encoding Dash does for figures
+        level = app.map_level(len(rows), app.MAP_ZOOM)
+
+        def build_map():
+            figure = app.street_map(trees.copy(), level=level)
+            figure.to_json()
+            return figure
+
+        runs, output = timed(build_map, repeat)
+        stages["map"] = summary(runs, output)
+
+        # end to end, with nothing cached and nothing on screen yet
+        click = None
+        if args["near"]:
+            click = {"points": [{"lat": args["near"][1], "lon": args["near"][2]}]}
+
+        def callback():
+            app.cached_diameter_density.cache_clear()
+            return app.main_callback(
+                args["start_date"],
+                args["end_date"],
+                args["neighbourhood"],
+                args["cultivar"],
+                args["diameter_range"],
+                args["map_selection"],
+                None,
+                args["near"][0] if args["near"] else None,
+                click,
+            )
+
+        runs, outputs = timed(callback, repeat)
+        stages["callback"] = summary(runs)
+        stages["callback"]["bytes"] = sum(payload_bytes(o) for o in outputs[:-1])
+
+        results.append(
+            {
+                "rows": len(app.raw_trees),
+                "scenario": name,
+                "matched": len(rows),
+                "map_level": level,
+                "stages": stages,
+            }
+        )
+        print(
+            "%9d %-15s %8d rows  callback %.3fs"
+            % (len(app.raw_trees), name, len(rows), stages["callback"]["median_s"]),
+            file=sys.stderr,
+        )
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    versions = {}
+    for module in ["numpy", "pandas", "altair", "plotly", "dash"]:
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return {
+        "time": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "versions": versions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the dashboard filters and chart builders"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=SIZES, help="dataset sizes (trees)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    parser.add_argument(
+        "--scenario", action="append", help="only run these scenarios (repeatable)"
+    )
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(run_worker(args.repeat, args.scenario), sys.stdout)
+        return
+
+    results = []
+    for size in args.sizes:
+        # a fresh interpreter per size, so every run loads its own data
+        env = dict(
+            os.environ,
+            CHERRY_DATA_DIR=dataset_dir(size, args.seed),
+            CHERRY_CACHE_MAX_MB="0",
+        )
+        command = [sys.executable, "-m", "benchmarks.charts", "--worker"]
+        command += ["--repeat", str(args.repeat)]
+        for scenario in args.scenario or []:
+            command += ["--scenario", scenario]
+        child = subprocess.run(
+            command, cwd=REPO_DIR, env=env, stdout=subprocess.PIPE, check=True
+        )
+        results.extend(json.loads(child.stdout))
+
+    report = {"benchmark": "charts", "environment": environment(), "results": results}
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import json
+import sys
+
+# Compare two benchmark result files written by benchmarks/charts.py.
+#
+#   python -m benchmarks.compare baseline.json candidate.json --threshold 1.2
+#
+# Prints the median time of every (rows, scenario, stage) in both runs and
+# exits with status 1 if any stage got slower than `threshold` times its
+# baseline. Stages faster than --min-time in the baseline are reported but
+# never fail the comparison, since their timings are mostly noise.
+
+
+def stage_medians(path):
+    with open(path) as f:
+        report = json.load(f)
+    medians = {}
+    for result in report["results"]:
+        for stage, timing in result["stages"].items():
+            key = (result["rows"], result["scenario"], stage)
+            medians[key] = (timing["median_s"], timing.get("bytes"))
+    return medians
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="slowdown ratio counted as a regression (default 1.2)",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.005,
+        help="ignore regressions of stages faster than this in seconds",
+    )
+    args = parser.parse_args()
+
+    baseline = stage_medians(args.baseline)
+    candidate = stage_medians(args.candidate)
+    regressions = []
+    print(
+        "%9s %-15s %-9s %10s %10s %7s %10s"
+        % ("rows", "scenario", "stage", "base (s)", "new (s)", "ratio", "bytes")
+    )
+    for key in sorted(set(baseline) & set(candidate)):
+        (base, _), (new, new_bytes) = baseline[key], candidate[key]
+        ratio = new / base if base else float("inf")
+        regressed = ratio > args.threshold and base >= args.min_time
+        if regressed:
+            regressions.append(key)
+        print(
+            "%9d %-15s %-9s %10.4f %10.4f %7.2f %10s%s"
+            % (
+                *key,
+                base,
+                new,
+                ratio,
+                "-" if new_bytes is None else new_bytes,
+                "  REGRESSION" if regressed else "",
+            )
+        )
+
+    missing = sorted(set(baseline) ^ set(candidate))
+    if missing:
+        print("\n%d stages only in one of the runs" % len(missing))
+    if regressions:
+        print(
+            "\n%d stages slower than %.2fx the baseline"
+            % (len(regressions), args.threshold)
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,500 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from benchmarks.charts import REPO_DIR, environment
+from benchmarks.synthetic import dataset_dir
+
+# End to end load test of main_callback against a local gunicorn server.
+#
+# Starts `gunicorn src.app:server` on localhost with the given worker and
+# thread counts (or targets an already running server with --url), then has
+# N simulated users replay sequences of `_dash-update-component` requests for
+# main_callback, carrying the chart signatures from one response to the next
+# like the browser does. Sequences are generated per scenario, or replayed
+# from a file. Reports throughput, latency percentiles and error rate per
+# scenario.
+#
+#   python -m benchmarks.loadtest --workers 5 --threads 1 --users 10
+#
+# A replay file has one JSON object per line, {"scenario": name, "session":
+# [state, ...]}, where every state maps main_callback inputs ("id.property")
+# to their values; inputs a state leaves out keep their default.
+
+# Vancouver, where the real and the synthetic trees are
+CENTER = (49.25, -123.12)
+
+DEFAULTS = {"slider_diameter.value": [0, 100]}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers, threads, data_dir, cache_mb, log):
+    port = free_port()
+    env = dict(os.environ, CHERRY_DATA_DIR=data_dir)
+    if cache_mb is not None:
+        env["CHERRY_CACHE_MAX_MB"] = str(cache_mb)
+        # a cold cache of its own, not the one of a running dashboard
+        env["CHERRY_CACHE_DIR"] = tempfile.mkdtemp(prefix="cherry_loadtest_")
+    command = [sys.executable, "-m", "gunicorn", "src.app:server"]
+    command += ["--workers", str(workers), "--threads", str(threads)]
+    command += ["--timeout", "1000", "-b", "127.0.0.1:%d" % port]
+    process = subprocess.Popen(
+        command, cwd=REPO_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    return process, "http://127.0.0.1:%d" % port
+
+
+def wait_ready(url, process=None, timeout=300):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError("server exited with status %d" % process.returncode)
+        try:
+            status, _ = Client(url).request("GET", "/_dash-layout")
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("server at %s not ready after %ds" % (url, timeout))
+
+
+class Client:
+    """Keep-alive HTTP connection of one simulated user."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.connection = None
+
+    def request(self, method, path, body=None):
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(
+                self.host, self.port, timeout=1000
+            )
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = None
+            raise
+
+
+def find_layout_options(layout, component_id):
+    # dropdown options straight from the served layout
+    if isinstance(layout, dict):
+        props = layout.get("props", {})
+        if props.get("id") == component_id:
+            return [o["value"] for o in props.get("options", [])]
+        children = list(layout.values())
+    elif isinstance(layout, list):
+        children = layout
+    else:
+        return None
+    for child in children:
+        found = find_layout_options(child, component_id)
+        if found is not None:
+            return found
+    return None
+
+
+class Callback:
+    """The main_callback endpoint as described by /_dash-dependencies."""
+
+    def __init__(self, client):
+        _, body = client.request("GET", "/_dash-dependencies")
+        spec = next(
+            d for d in json.loads(body) if "chart-signatures.data" in d["output"]
+        )
+        self.output = spec["output"]
+        self.outputs = [
+            dict(zip(["id", "property"], o.rsplit(".", 1)))
+            for o in spec["output"].strip(".").split("...")
+        ]
+        self.inputs = spec["inputs"]
+        self.state = spec["state"]
+
+    def body(self, state, previous, signatures):
+        def key(item):
+            return item["id"] + "." + item["property"]
+
+        changed = [
+            key(i) for i in self.inputs if state.get(key(i)) != previous.get(key(i))
+        ]
+        return json.dumps(
+            {
+                "output": self.output,
+                "outputs": self.outputs,
+                "inputs": [dict(i, value=state.get(key(i))) for i in self.inputs],
+                "state": [
+                    dict(
+                        s,
+                        value=signatures if key(s) == "chart-signatures.data" else None,
+                    )
+                    for s in self.state
+                ],
+                "changedPropIds": changed or [key(self.inputs[0])],
+            }
+        )
+
+
+def viewport(lat, lon, zoom):
+    # approximate corners of a 1000x600px map at `zoom`
+    half_lon = 500 * 360 / 512 / 2**zoom
+    half_lat = 300 * 360 / 512 / 2**zoom * np.cos(np.radians(lat))
+    return [
+        [lon - half_lon, lat + half_lat],
+        [lon + half_lon, lat + half_lat],
+        [lon + half_lon, lat - half_lat],
+        [lon - half_lon, lat - half_lat],
+    ]
+
+
+def sample(rng, values, most=3):
+    return rng.sample(values, min(rng.randint(0, most), len(values)))
+
+
+def random_point(rng, spread=0.03):
+    return CENTER[0] + rng.uniform(-spread, spread), CENTER[1] + rng.uniform(
+        -spread * 1.5, spread * 1.5
+    )
+
+
+# Scenario generators: one simulated session as a list of input states, each
+# a change of the previous one, like a visitor using the dashboard
+
+
+def session_initial(rng, options, length):
+    # new visitors loading the page
+    return [{}]
+
+
+def session_filters(rng, options, length):
+    state, session = {}, []
+    for _ in range(length):
+        state = dict(state)
+        change = rng.choice(["neighbourhood", "cultivar", "diameter", "dates"])
+        if change == "neighbourhood":
+            state["filter_neighbourhood.value"] = sample(rng, options["neighbourhoods"])
+        elif change == "cultivar":
+            state["filter_cultivar.value"] = sample(rng, options["cultivars"])
+        elif change == "diameter":
+            lo = rng.randrange(0, 60, 5)
+            state["slider_diameter.value"] = [lo, rng.randrange(lo + 5, 151, 5)]
+        else:
+            month = rng.randint(1, 5)
+            state["picker_date.start_date"] = "2022-%02d-01" % month
+            state["picker_date.end_date"] = "2022-%02d-%02d" % (
+                month,
+                rng.randint(2, 28),
+            )
+        session.append(state)
+    return session
+
+
+def session_repeat(rng, options, length):
+    # a handful of popular states, answered from the result cache once warm
+    popular = [
+        {},
+        {"filter_neighbourhood.value": options["neighbourhoods"][:1]},
+        {"filter_cultivar.value": options["cultivars"][:1]},
+        {"picker_date.start_date": "2022-04-01", "picker_date.end_date": "2022-04-15"},
+    ]
+    return [rng.choice(popular) for _ in range(length)]
+
+
+def session_map(rng, options, length):
+    state, session = {}, []
+    for _ in range(length):
+        state = dict(state)
+        change = rng.choice(["zoom", "box", "lasso", "clear"])
+        lat, lon = random_point(rng)
+        if change == "zoom":
+            zoom = rng.uniform(11, 17)
+            state["map-view.data"] = {
+                "zoom": zoom,
+                "center": {"lat": lat, "lon": lon},
+                "bounds": viewport(lat, lon, zoom),
+                "revision": "",
+            }
+        elif change == "box":
+            state["map-selection.data"] = {
+                "range": [[lon - 0.01, lat + 0.005], [lon + 0.01, lat - 0.005]]
+            }
+        elif change == "lasso":
+            state["map-selection.data"] = {
+                "lasso": [
+                    [lon + 0.01 * np.cos(a), lat + 0.006 * np.sin(a)]
+                    for a in np.linspace(0, 2 * np.pi, 24, endpoint=False)
+                ]
+            }
+        else:
+            state["map-selection.data"] = None
+        session.append(state)
+    return session
+
+
+def session_near(rng, options, length):
+    state, session = {}, []
+    for _ in range(length):
+        lat, lon = random_point(rng)
+        state = dict(
+            state,
+            **{
+                "filter_radius.value": rng.choice([250, 500, 1000, 2000]),
+                "map.clickData": {"points": [{"lat": lat, "lon": lon}]},
+            }
+        )
+        session.append(state)
+    return session
+
+
+SCENARIOS = {
+    "initial": session_initial,
+    "filters": session_filters,
+    "repeat": session_repeat,
+    "map": session_map,
+    "near": session_near,
+}
+
+
+def read_replay(path):
+    sessions = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                sessions.setdefault(record["scenario"], []).append(record["session"])
+    return sessions
+
+
+def run_user(url, callback, next_session, deadline, samples, lock):
+    client = Client(url)
+    while time.monotonic() < deadline:
+        previous, signatures = {}, None
+        for state in next_session():
+            if time.monotonic() >= deadline:
+                return
+            state = dict(DEFAULTS, **state)
+            body = callback.body(state, previous, signatures)
+            start = time.perf_counter()
+            try:
+                status, data = client.request("POST", "/_dash-update-component", body)
+            except (OSError, http.client.HTTPException):
+                status, data = None, b""
+            latency = time.perf_counter() - start
+            with lock:
+                samples.append((latency, status, len(data)))
+            if status == 200:
+                response = json.loads(data).get("response", {})
+                signatures = response.get("chart-signatures", {}).get(
+                    "data", signatures
+                )
+            previous = state
+
+
+def run_scenario(url, callback, next_session, users, duration):
+    samples, lock = [], threading.Lock()
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(
+            target=run_user,
+            args=(url, callback, next_session, deadline, samples, lock),
+        )
+        for _ in range(users)
+    ]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    latencies = np.array([s[0] for s in samples])
+    errors = sum(1 for s in samples if s[1] != 200)
+    ok = len(samples) - errors
+    p50, p95, p99 = (
+        np.percentile(latencies, [50, 95, 99]) if len(samples) else (None,) * 3
+    )
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else None,
+        "throughput_rps": ok / elapsed,
+        "p50_s": p50,
+        "p95_s": p95,
+        "p99_s": p99,
+        "mean_bytes": float(np.mean([s[2] for s in samples])) if samples else None,
+        "elapsed_s": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test main_callback against a local gunicorn server"
+    )
+    parser.add_argument("--url", help="test a running server instead of starting one")
+    parser.add_argument("--workers", type=int, default=5, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=1, help="threads per worker")
+    parser.add_argument(
+        "--size",
+        type=int,
+        help="serve a synthetic dataset of this many trees (default: the real data)",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=float,
+        help="result cache size for the server, 0 disables it "
+        "(default: the app's default, in a fresh directory)",
+    )
+    parser.add_argument("--users", type=int, default=10, help="concurrent users")
+    parser.add_argument(
+        "--duration", type=float, default=30, help="seconds per scenario"
+    )
+    parser.add_argument(
+        "--session-length", type=int, default=10, help="interactions per session"
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="scenarios to run (repeatable, default: all)",
+    )
+    parser.add_argument("--replay", help="replay sessions from this file instead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="also write the results as JSON here")
+    args = parser.parse_args()
+
+    process, log = None, None
+    url = args.url
+    if url is None:
+        data_dir = (
+            dataset_dir(args.size) if args.size else os.path.join(REPO_DIR, "data")
+        )
+        log = tempfile.NamedTemporaryFile(
+            prefix="cherry_loadtest_", suffix=".log", delete=False
+        )
+        print("starting gunicorn, log in %s" % log.name, file=sys.stderr)
+        process, url = start_server(
+            args.workers,
+            args.threads,
+            data_dir,
+            None if args.cache_mb is None else args.cache_mb,
+            log,
+        )
+    try:
+        wait_ready(url, process)
+        client = Client(url)
+        callback = Callback(client)
+        _, layout = client.request("GET", "/_dash-layout")
+        layout = json.loads(layout)
+        options = {
+            "neighbourhoods": find_layout_options(layout, "filter_neighbourhood") or [],
+            "cultivars": find_layout_options(layout, "filter_cultivar") or [],
+        }
+
+        if args.replay:
+            makers = {
+                name: (lambda sessions: lambda rng, *_: rng.choice(sessions))(sessions)
+                for name, sessions in read_replay(args.replay).items()
+            }
+        else:
+            makers = {name: SCENARIOS[name] for name in args.scenario or SCENARIOS}
+
+        # users draw their sessions from one seeded generator
+        rng = random.Random(args.seed)
+        rng_lock = threading.Lock()
+
+        def generator(make):
+            def next_session():
+                with rng_lock:
+                    return make(rng, options, args.session_length)
+
+            return next_session
+
+        scenarios = {name: generator(make) for name, make in makers.items()}
+
+        results = {}
+        print(
+            "%-10s %8s %7s %9s %8s %8s %8s %10s"
+            % (
+                "scenario",
+                "requests",
+                "errors",
+                "req/s",
+                "p50 ms",
+                "p95 ms",
+                "p99 ms",
+                "bytes",
+            ),
+        )
+        for name, next_session in scenarios.items():
+            result = results[name] = run_scenario(
+                url, callback, next_session, args.users, args.duration
+            )
+            print(
+                "%-10s %8d %7d %9.1f %8s %8s %8s %10s"
+                % (
+                    name,
+                    result["requests"],
+                    result["errors"],
+                    result["throughput_rps"],
+                    *(
+                        "-" if result[p] is None else "%.0f" % (1000 * result[p])
+                        for p in ["p50_s", "p95_s", "p99_s"]
+                    ),
+                    (
+                        "-"
+                        if result["mean_bytes"] is None
+                        else "%.0f" % result["mean_bytes"]
+                    ),
+                )
+            )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if args.out:
+        report = {
+            "benchmark": "loadtest",
+            "environment": environment(),
+            "config": {
+                "url": args.url,
+                "workers": args.workers,
+                "threads": args.threads,
+                "size": args.size,
+                "cache_mb": args.cache_mb,
+                "users": args.users,
+                "duration_s": args.duration,
+                "session_length": args.session_length,
+                "replay": args.replay,
+                "seed": args.seed,
+            },
+            "results": results,
+        }
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2, default=float)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.process_data import DATA_DIR, read_bloom_range
+from src.snapshot import write_snapshot
+
+# Synthetic street trees shaped like the processed snapshot, for benchmarks.
+#
+# Trees are spread around the centre of every neighbourhood of
+# data/vancouver.geojson and get a cultivar (and its bloom period) from
+# data/bloom_range.csv, so every filter and chart of the app has realistic
+# work to do at any size.
+
+BENCH_DIR = os.path.join(tempfile.gettempdir(), "cherry_blossom_bench")
+
+
+def make_trees(n, seed=0):
+    """Processed trees frame with `n` synthetic trees."""
+    rng = np.random.default_rng(seed)
+
+    with open(os.path.join(DATA_DIR, "vancouver.geojson")) as f:
+        features = json.load(f)["features"]
+    neighbourhoods = np.array([f["properties"]["name"] for f in features], dtype=object)
+    centres = np.array([f["properties"]["geo_point_2d"] for f in features])
+    hood = rng.integers(0, len(features), n)
+
+    bloom_range = read_bloom_range(os.path.join(DATA_DIR, "bloom_range.csv"))
+    cultivars = bloom_range["CULTIVAR_NAME"].str.title().to_numpy(dtype=object)
+    cultivar = rng.integers(0, len(cultivars), n)
+    # a few trees have no cultivar and so no bloom period
+    no_cultivar = rng.random(n) < 0.05
+    cultivar_name = np.where(no_cultivar, "No_Cultivar", cultivars[cultivar])
+    bloom_start = bloom_range["BLOOM_START"].to_numpy()[cultivar]
+    bloom_end = bloom_range["BLOOM_END"].to_numpy()[cultivar]
+    bloom_start[no_cultivar] = np.datetime64("NaT")
+    bloom_end[no_cultivar] = np.datetime64("NaT")
+
+    # inches, one decimal, with some whole numbers like the city's data
+    diameter = np.round(rng.gamma(2.0, 6.0, n), 1)
+    whole = rng.random(n) < 0.1
+    diameter[whole] = np.round(diameter[whole])
+
+    trees = pd.DataFrame(
+        {
+            "TREE_ID": np.arange(1, n + 1),
+            "NEIGHBOURHOOD_NAME": neighbourhoods[hood],
+            "CULTIVAR_NAME": cultivar_name,
+            "COMMON_NAME": np.char.add(cultivar_name.astype(str), " Cherry"),
+            "DIAMETER": diameter,
+            "lat": centres[hood, 0] + rng.normal(0, 0.006, n),
+            "lon": centres[hood, 1] + rng.normal(0, 0.009, n),
+            "BLOOM_START": bloom_start,
+            "BLOOM_END": bloom_end,
+        }
+    )
+    return trees
+
+
+def dataset_dir(n, seed=0):
+    """Data directory holding a snapshot of `n` synthetic trees.
+
+    Datasets are written once under BENCH_DIR and reused by later runs.
+    """
+    path = os.path.join(BENCH_DIR, "trees-%d-seed%d" % (n, seed))
+    snapshot = os.path.join(path, "processed_trees")
+    if not os.path.exists(os.path.join(snapshot, "meta.json")):
+        os.makedirs(path, exist_ok=True)
+        write_snapshot(make_trees(n, seed), snapshot, info={"synthetic": True})
+    return path
@@ -0,0 +1,45 @@
+import gc
+import os
+
+# Gunicorn settings, read by `gunicorn src.app:server` when run from the repo
+# root, including by app.yaml's entrypoint. Command line options override
+# them.
+#
+# With preload_app the master process imports src.app once, memory-mapping
+# the trees snapshot and building the filter and spatial indexes, and then
+# forks the workers. The workers share those read-only NumPy arrays with the
+# master copy-on-write instead of each building its own copy, and start
+# serving as soon as they are forked. Set CHERRY_PRELOAD=0 to load the app in
+# every worker instead.
+
+bind = "0.0.0.0:%s" % os.environ.get("PORT", "8000")
+# workers are left to gunicorn: WEB_CONCURRENCY, else 1 (the Dockerfile sets 5)
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+timeout = 1000
+preload_app = os.environ.get("CHERRY_PRELOAD", "1") != "0"
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before any worker is
+    # forked. Frozen objects are never visited by the garbage collector, so
+    # collections in the workers don't write to, and so copy, the pages they
+    # share with the master.
+    if preload_app:
+        gc.collect()
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    # With CHERRY_CHART_PROCESSES set, every worker forks its chart processes
+    # while it is still single threaded, so they inherit no held locks
+    if int(os.environ.get("CHERRY_CHART_PROCESSES", "0")) > 0:
+        from src.app import start_chart_pool
+
+        start_chart_pool()
+
+    # With CHERRY_PREWARM=1, every worker imports what was deferred and builds
+    # the default view in the background as soon as it starts serving
+    if os.environ.get("CHERRY_PREWARM", "0") == "1":
+        from src.app import start_prewarm
+
+        start_prewarm()
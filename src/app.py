@@ -1,38 +1,163 @@
-import pandas as pd
-from dash import Dash, html, dcc, Input, Output, no_update
-import altair as alt
-import dash_bootstrap_components as dbc
+import functools
+import hashlib
+import importlib.metadata
+import json
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import date
-import plotly.express as px
 
-alt.data_transformers.disable_max_rows()
+from src import startup
+from src.startup import timed
 
-# Data (wrangled)
-raw_trees = pd.read_csv("data/processed_trees.csv")
-raw_trees["BLOOM_START"] = pd.to_datetime(raw_trees["BLOOM_START"], format="%d/%m/%Y")
-raw_trees["BLOOM_END"] = pd.to_datetime(raw_trees["BLOOM_END"], format="%d/%m/%Y")
-raw_trees["CULTIVAR_NAME"] = raw_trees["CULTIVAR_NAME"].str.title()
-raw_trees["COMMON_NAME"] = raw_trees["COMMON_NAME"].str.title()
+with timed("numpy, pandas", "import"):
+    import numpy as np
+    import pandas as pd
+with timed("dash, flask", "import"):
+    from dash import Dash, html, dcc, Input, Output, State, no_update
+    from flask import Response, abort, g, jsonify, request
+    import dash_bootstrap_components as dbc
 
-# Vancouver geojson
-url_geojson = "https://raw.githubusercontent.com/UBC-MDS/cherry_blossom_tracker/main/data/vancouver.geojson"
-data_geojson_remote = alt.Data(
-    url=url_geojson, format=alt.DataFormat(property="features", type="json")
+with timed("src", "import"):
+    from src.cache import MISSING, ResultCache, private_directory
+    from src.density import diameter_counts, diameter_density
+    from src.filters import FilterCube, FilterIndex, to_bits, to_rows
+    from src.metrics import BYTES, Registry
+    from src.snapshot import load_trees, snapshot_version
+    from src.spatial import SpatialGrid, grid_clusters, viewport_box
+    from src.vega import ChartTemplate, dumps
+
+# Altair and Plotly Express are only needed to build charts. In fast start
+# mode they are imported when the first chart is built, or by prewarm()
+LAZY_IMPORTS = os.environ.get("CHERRY_LAZY_IMPORTS", "0") == "1"
+PREWARM = os.environ.get("CHERRY_PREWARM", "0") == "1"
+alt = startup.lazy_import(
+    "altair",
+    on_import=lambda alt: alt.data_transformers.disable_max_rows(),
+    lazy=LAZY_IMPORTS,
+)
+px = startup.lazy_import("plotly.express", lazy=LAZY_IMPORTS)
+
+# Data (wrangled by src/process_data.py)
+DATA_DIR = os.environ.get("CHERRY_DATA_DIR", "data")
+with timed("load trees"):
+    raw_trees = load_trees(DATA_DIR)
+with timed("filter index"):
+    filter_index = FilterIndex(raw_trees)
+with timed("filter cube"):
+    filter_cube = FilterCube(raw_trees, filter_index.intervals)
+with timed("spatial grid"):
+    spatial_grid = SpatialGrid(raw_trees["lat"], raw_trees["lon"])
+
+# Bump whenever the cached chart outputs change, so a deploy never serves
+# charts cached by the previous code. Upgrading the chart libraries changes
+# the namespace too.
+CHART_FORMAT = 3
+CHART_LIBRARIES = "-".join(
+    name + importlib.metadata.version(name) for name in ("altair", "plotly")
 )
 
+# Chart outputs cached on disk across workers, per data snapshot and chart
+# format
+with timed("result cache"):
+    cache_dir = os.environ.get("CHERRY_CACHE_DIR")
+    if cache_dir is None:
+        cache_dir = private_directory(
+            os.path.join(
+                tempfile.gettempdir(), "cherry_blossom_cache-%d" % os.getuid()
+            )
+        )
+    result_cache = ResultCache(
+        cache_dir,
+        namespace="%s-charts%d-%s"
+        % (snapshot_version(DATA_DIR), CHART_FORMAT, CHART_LIBRARIES),
+        max_bytes=int(
+            float(os.environ.get("CHERRY_CACHE_MAX_MB", "256")) * 1024 * 1024
+        ),
+    )
+
+# Per stage timings and payload sizes, served on /metrics
+metrics = Registry(
+    os.environ.get(
+        "CHERRY_METRICS_DIR",
+        os.path.join(tempfile.gettempdir(), "cherry_blossom_metrics"),
+    )
+)
+metrics.histogram("cherry_callback_seconds", "main_callback duration")
+metrics.histogram(
+    "cherry_callback_stage_seconds", "Duration of each stage of main_callback"
+)
+metrics.histogram(
+    "cherry_chart_build_seconds", "Time to build a chart, including serialization"
+)
+metrics.histogram(
+    "cherry_chart_serialize_seconds", "Time to fill in the data of a chart's HTML"
+)
+metrics.histogram("cherry_chart_bytes", "Size of a rebuilt Altair chart", BYTES)
+metrics.counter(
+    "cherry_chart_updates", "Charts sent rebuilt, from the cache, or left unchanged"
+)
+metrics.histogram("cherry_http_request_seconds", "HTTP request duration")
+metrics.histogram("cherry_http_response_bytes", "HTTP response size", BYTES)
+
+# With CHERRY_CHART_PROCESSES set, the charts a callback rebuilds are built
+# in parallel by that many processes forked from the worker (see run_builders)
+CHART_PROCESSES = int(os.environ.get("CHERRY_CHART_PROCESSES", "0"))
+
+# Street map level of detail: above MAP_MAX_MARKERS trees, the map shows
+# clusters until zoomed in to MAP_CLUSTER_MAX_ZOOM
+MAP_ZOOM = 10.9
+MAP_MAX_MARKERS = int(os.environ.get("CHERRY_MAP_MAX_MARKERS", "5000"))
+MAP_CLUSTER_MAX_ZOOM = 15
+MAP_LAT0 = float(np.nanmean(raw_trees["lat"])) if len(raw_trees) else 49.25
+
+# Vancouver geojson, loaded once and embedded in the density map
+GEOJSON_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "vancouver.geojson")
+with timed("geojson"), open(GEOJSON_PATH) as f:
+    vancouver_features = json.load(f)["features"]
+
+# With CHERRY_CHARTS_IN_PAGE=1, the Altair charts are drawn into the page by
+# Vega, served from src/assets/vega, instead of each being a page of its own in
+# an iframe. Vega is then loaded once, and the charts only receive their data
+CHARTS_IN_PAGE = os.environ.get("CHERRY_CHARTS_IN_PAGE", "0") == "1"
+CHART_PROPERTY = "data" if CHARTS_IN_PAGE else "srcDoc"
+VEGA_SCRIPTS = [
+    "/assets/vega/vega.min.js",
+    "/assets/vega/vega-lite.min.js",
+    "/assets/vega/vega-embed.min.js",
+]
+
 # Setup app and layout/frontend
+layout_start = time.perf_counter()
 app = Dash(
     __name__,
     external_stylesheets=[
         "https://fonts.googleapis.com/css2?family=Montserrat:wght@300&display=swap",
         dbc.themes.BOOTSTRAP,
     ],
+    # the Vega scripts are only loaded in order, and when used
+    external_scripts=VEGA_SCRIPTS if CHARTS_IN_PAGE else [],
+    assets_ignore=r"^vega.*\.js$",
 )
 
 server = app.server
 
 # C O M P O N E N T S
 
+
+def chart_view(name, style=None):
+    # The chart's page in an iframe, or its data in a store that the in-page
+    # renderer draws into the div below it
+    if not CHARTS_IN_PAGE:
+        return html.Iframe(id=name, style=style)
+    return html.Div([dcc.Store(id=name), html.Div(id=name + "-view", style=style)])
+
+
 # Collapse
 
 toast = html.Div(
@@ -99,10 +224,32 @@ range_slider = dcc.RangeSlider(
     tooltip={"placement": "bottom", "always_visible": True},
 )
 
+# Radius (m) around the tree last clicked on the street map
+NEAR_RADII = [250, 500, 1000, 2000]
+drop_radius = dcc.Dropdown(
+    id="filter_radius",
+    placeholder="Click a tree on the map, then pick a distance",
+    options=[
+        {
+            "label": "Within %s of the clicked tree"
+            % ("%g km" % (r / 1000) if r >= 1000 else "%d m" % r),
+            "value": r,
+        }
+        for r in NEAR_RADII
+    ],
+    clearable=True,
+)
+
 # L A Y O U T
 app.title = "Vancouver Cherry Blossom Tracker"
 app.layout = dbc.Container(
     [
+        # signatures of the data behind the charts currently on screen
+        dcc.Store(id="chart-signatures"),
+        # last zoom/pan of the street map, see update_map_view
+        dcc.Store(id="map-view"),
+        # box/lasso geometry of the street map selection
+        dcc.Store(id="map-selection"),
         dbc.Toast(
             [
                 html.A(
@@ -214,6 +361,10 @@ app.layout = dbc.Container(
                         dbc.Col(
                             [
                                 html.Label(["Cherry blossom tree map"]),
+                                dbc.Row(
+                                    dbc.Col(drop_radius, width=4),
+                                    style={"padding-bottom": "5px"},
+                                ),
                                 dbc.Col(
                                     [
                                         dcc.Loading(
@@ -238,7 +389,7 @@ app.layout = dbc.Container(
                                 dcc.Loading(
                                     id="loading-2",
                                     type="circle",
-                                    children=html.Iframe(id="bar"),
+                                    children=chart_view("bar"),
                                     color="#B665A4",
                                 ),
                             ],
@@ -251,7 +402,7 @@ app.layout = dbc.Container(
                                 dcc.Loading(
                                     id="loading-3",
                                     type="circle",
-                                    children=html.Iframe(id="timeline"),
+                                    children=chart_view("timeline"),
                                     color="#B665A4",
                                 ),
                             ],
@@ -269,7 +420,7 @@ app.layout = dbc.Container(
                                 dcc.Loading(
                                     id="loading-4",
                                     type="circle",
-                                    children=html.Iframe(id="diameter"),
+                                    children=chart_view("diameter"),
                                     color="#B665A4",
                                 ),
                             ],
@@ -282,8 +433,8 @@ app.layout = dbc.Container(
                                 dcc.Loading(
                                     id="loading-5",
                                     type="circle",
-                                    children=html.Iframe(
-                                        id="density",
+                                    children=chart_view(
+                                        "density",
                                         style={
                                             "height": "400px",
                                             "width": "100%",
@@ -305,10 +456,42 @@ app.layout = dbc.Container(
     id="content",
 )
 
+startup.record("layout", layout_start)
+
 # C H A R T  F U N C T I O N S
 
 
-def street_map(df):
+# Altair charts are compiled once into templates of their HTML page (see
+# src/vega.py), and every callback only fills in the data
+chart_templates = {}
+
+
+def chart_template(name):
+    template = chart_templates.get(name)
+    if template is None:
+        template = chart_templates[name] = CHART_TEMPLATES[name]()
+    return template
+
+
+def render_chart(name, **datasets):
+    template = chart_template(name)
+    with metrics.timer("cherry_chart_serialize_seconds", chart=name):
+        if CHARTS_IN_PAGE:
+            # the in-page renderer fetches the spec once, then only gets data
+            return dumps(
+                {
+                    "chart": name,
+                    "spec": "/charts/%s.vl.json" % name,
+                    "datasets": template.data(**datasets),
+                }
+            )
+        return template.render(**datasets)
+
+
+def street_map(df, level=None, uirevision=None):
+    if level is not None:
+        return cluster_map(df, level, uirevision)
+
     df["DIAMETER_CM"] = df["DIAMETER"] * 2.54
 
     map_plot = px.scatter_mapbox(
@@ -317,13 +500,15 @@ def street_map(df):
         lon="lon",
         color_discrete_sequence=["#B665A4"],
         custom_data=[df.COMMON_NAME, df.NEIGHBOURHOOD_NAME, df.DIAMETER, df.TREE_ID],
-        zoom=10.9,
+        zoom=MAP_ZOOM,
         height=600,
         opacity=0.8,
     )
     map_plot.update_layout(
         mapbox_style="open-street-map", autosize=True, margin=dict(t=0, b=0, l=0, r=0)
     )
+    # keep the user's pan/zoom across updates until the neighbourhoods change
+    map_plot.update_layout(uirevision=uirevision)
 
     map_plot.update_xaxes(visible=False)
     map_plot.update_yaxes(visible=False)
@@ -335,53 +520,135 @@ def street_map(df):
     return map_plot
 
 
-def density_map(df):
-    df["DIAMETER_CM"] = df["DIAMETER"] * 2.54
+def cluster_map(df, level, uirevision=None):
+    # Trees aggregated into grid cells sized for the zoom level
+    clusters = grid_clusters(df["lat"], df["lon"], level, MAP_LAT0)
+    clusters["kind"] = "cluster"
+
+    map_plot = px.scatter_mapbox(
+        clusters,
+        lat="lat",
+        lon="lon",
+        size="count",
+        size_max=30,
+        color_discrete_sequence=["#B665A4"],
+        custom_data=["kind", "count"],
+        zoom=MAP_ZOOM,
+        height=600,
+        opacity=0.8,
+    )
+    map_plot.update_layout(
+        mapbox_style="open-street-map",
+        autosize=True,
+        margin=dict(t=0, b=0, l=0, r=0),
+        uirevision=uirevision,
+    )
+
+    map_plot.update_xaxes(visible=False)
+    map_plot.update_yaxes(visible=False)
+
+    map_plot.update_traces(
+        hovertemplate="Trees: %{customdata[1]}<br>Zoom in to see individual trees"
+    )
+
+    return map_plot
+
 
-    van_base = (
-        alt.Chart(data_geojson_remote)
-        .mark_geoshape(fill="lightgray")
-        .project(type="identity", reflectY=True)
+def map_level(n_trees, zoom):
+    """Zoom level to cluster the map at, or None to draw individual trees."""
+    if n_trees <= MAP_MAX_MARKERS or zoom >= MAP_CLUSTER_MAX_ZOOM:
+        return None
+    return int(zoom)
+
+
+def density_map(df):
+    # Aggregate per neighbourhood here so the chart carries one row per polygon,
+    # summing the diameters in float64 like the filter cube
+    stats = (
+        df["DIAMETER"]
+        .astype("float64")
+        .groupby(df["NEIGHBOURHOOD_NAME"], observed=True)
+        .agg(["size", "sum"])
     )
+    stats = pd.DataFrame(
+        {
+            "NEIGHBOURHOOD_NAME": stats.index.astype(str),
+            "count": stats["size"].to_numpy(),
+            "mean_diameter": stats["sum"].to_numpy()
+            / stats["size"].to_numpy()
+            * 2.54,
+        }
+    )
+    return density_chart(stats)
+
+
+def density_chart(stats):
+    # stats: NEIGHBOURHOOD_NAME, count and mean_diameter (cm) per neighbourhood.
+    # Rounded, so that the row and cube paths, whose totals are summed in a
+    # different order, send the same data
+    stats["mean_diameter"] = stats["mean_diameter"].round(2)
+    return render_chart("density", density=stats)
+
+
+def density_template():
+    # The neighbourhood shapes are part of the template, only the stats vary
+    neighbourhoods = alt.Data(values=vancouver_features)
+    van_base = alt.Chart(neighbourhoods).mark_geoshape(fill="lightgray")
 
     plot_van = (
         van_base
-        + alt.Chart(df)
+        + alt.Chart(neighbourhoods)
         .transform_lookup(
-            default="0",
-            as_="geo",
-            lookup="NEIGHBOURHOOD_NAME",
-            from_=alt.LookupData(data=data_geojson_remote, key="properties.name"),
+            lookup="properties.name",
+            from_=alt.LookupData(
+                data=alt.NamedData("density"),
+                key="NEIGHBOURHOOD_NAME",
+                fields=["count", "mean_diameter"],
+            ),
         )
+        .transform_filter("isValid(datum.count)")
         .mark_geoshape()
         .encode(
             alt.Color(
-                "count()",
+                "count:Q",
                 scale=alt.Scale(scheme="redpurple"),
                 legend=alt.Legend(orient="bottom", title="Number of Trees"),
             ),
-            alt.Shape(field="geo", type="geojson"),
             tooltip=[
-                alt.Tooltip("NEIGHBOURHOOD_NAME:N", title="Neighbourhood"),
-                alt.Tooltip("count()", title="No. of trees"),
+                alt.Tooltip("properties.name:N", title="Neighbourhood"),
+                alt.Tooltip("count:Q", title="No. of trees"),
                 alt.Tooltip(
-                    "DIAMETER_CM:Q",
+                    "mean_diameter:Q",
                     title="Mean tree diameter (cm)",
-                    aggregate="mean",
                     format=".2f",
                 ),
             ],
         )
     ).project(type="identity", reflectY=True)
 
-    return plot_van.to_html()
+    return ChartTemplate(plot_van, ["density"])
 
 
 def bar_plot(trees_bar):
     trees_bar = trees_bar.dropna(subset=["CULTIVAR_NAME", "NEIGHBOURHOOD_NAME"])
 
+    # Count trees per cultivar here so the chart only embeds one row per cultivar
+    counts = trees_bar["CULTIVAR_NAME"].value_counts(sort=False)
+    return bar_chart(counts)
+
+
+def bar_chart(counts):
+    # counts: number of trees by cultivar name
+    counts = counts[counts > 0]
+    bar_data = pd.DataFrame(
+        {"CULTIVAR_NAME": counts.index.astype(str), "count": counts.to_numpy()}
+    )
+    return render_chart("bar", bar=bar_data)
+
+
+def bar_template():
     bar_plot = (
-        alt.Chart(trees_bar)
+        alt.Chart(alt.NamedData("bar"))
         .mark_bar()
         .encode(
             x=alt.X("count:Q", axis=alt.Axis(title="Number of Trees")),
@@ -392,22 +659,34 @@ def bar_plot(trees_bar):
             ),
             tooltip=alt.Tooltip("count:Q"),
         )
-        .transform_aggregate(count="count()", groupby=["CULTIVAR_NAME"])
         .configure_mark(opacity=0.6, color="#F3B2D2")
     )
 
-    return bar_plot.to_html()
+    return ChartTemplate(bar_plot, ["bar"])
 
 
 def timeline_plot(trees_timeline):
     trees_timeline = trees_timeline.dropna(subset=["BLOOM_START", "BLOOM_END"])
 
+    # One bar per distinct cultivar bloom period rather than one per tree
+    trees_timeline = (
+        trees_timeline.groupby(
+            ["CULTIVAR_NAME", "BLOOM_START", "BLOOM_END"], observed=True
+        )
+        .size()
+        .reset_index(name="count")
+    )
+    trees_timeline["CULTIVAR_NAME"] = trees_timeline["CULTIVAR_NAME"].astype(str)
+    return render_chart("timeline", timeline=trees_timeline)
+
+
+def timeline_template():
     timeline = (
-        alt.Chart(trees_timeline)
+        alt.Chart(alt.NamedData("timeline"))
         .mark_bar()
         .encode(
             x=alt.X(
-                "BLOOM_START",
+                "BLOOM_START:T",
                 axis=alt.Axis(
                     values=[
                         d.isoformat()
@@ -424,8 +703,9 @@ def timeline_plot(trees_timeline):
             x2="BLOOM_END",
             y=alt.Y("CULTIVAR_NAME:N", title=None, sort="x"),
             tooltip=[
-                alt.Tooltip("BLOOM_START", title="Start"),
-                alt.Tooltip("BLOOM_END", title="End"),
+                alt.Tooltip("BLOOM_START:T", title="Start"),
+                alt.Tooltip("BLOOM_END:T", title="End"),
+                alt.Tooltip("count:Q", title="No. of trees"),
             ],
         )
         .configure_mark(color="#F3B2D2")
@@ -433,19 +713,35 @@ def timeline_plot(trees_timeline):
         .configure_view(strokeOpacity=0)
     )
 
-    return timeline.to_html()
+    return ChartTemplate(timeline, ["timeline"])
+
+
+@functools.lru_cache(maxsize=128)
+def cached_diameter_density(counts):
+    # Per worker LRU keyed by the binned counts (as bytes), so repeated filter
+    # states with the same diameters reuse the curve. lru_cache is thread safe
+    return diameter_density(np.frombuffer(counts, dtype=np.int64))
+
+
+def binned_diameters(diameter):
+    # Trees per DIAMETER_GRID point (cm) from diameters in inches, which is
+    # all the density curve depends on
+    diameter_cm = np.asarray(diameter, dtype="float64") * 2.54
+    diameter_cm = diameter_cm[(diameter_cm >= 0) & (diameter_cm <= 150)]
+    return diameter_counts(diameter_cm).astype(np.int64)
 
 
 def diameter_plot(trees_df):
-    trees_df = trees_df.dropna(subset=["DIAMETER"])
-    trees_df["DIAMETER_CM"] = trees_df["DIAMETER"] * 2.54
-    trees_df = trees_df.loc[(trees_df['DIAMETER_CM'] >= 0) & (trees_df["DIAMETER_CM"] <= 150)]
-    # trees_df["MEAN_DIAM"] = trees_df['DIAMETER_CM'].mean()
+    # Only the density curve is embedded, not the trees
+    counts = binned_diameters(trees_df["DIAMETER"].to_numpy())
+    grid, density = cached_diameter_density(counts.tobytes())
+    density_data = pd.DataFrame({"DIAMETER": grid, "density": density})
+    return render_chart("diameter", diameter=density_data)
 
 
+def diameter_template():
     diameter = (
-        alt.Chart(trees_df)
-        .transform_density("DIAMETER_CM", as_=["DIAMETER", "density"])
+        alt.Chart(alt.NamedData("diameter"))
         .mark_area(
             interpolate="monotone",
             color="#F3B2D2",
@@ -453,33 +749,372 @@ def diameter_plot(trees_df):
             line=({"color": "#B665A4"}),
         )
         .encode(
-            alt.X("DIAMETER", title="Tree diameter (cm)", scale=alt.Scale(
+            alt.X("DIAMETER:Q", title="Tree diameter (cm)", scale=alt.Scale(
                 domain=(0, 160))),
             alt.Y("density:Q", title="Density", axis=alt.Axis(labels=False))
         )
     )
-    return diameter.to_html()
+    return ChartTemplate(diameter, ["diameter"])
+
+
+CHART_TEMPLATES = {
+    "bar": bar_template,
+    "timeline": timeline_template,
+    "diameter": diameter_template,
+    "density": density_template,
+}
+
+if not LAZY_IMPORTS:
+    with timed("chart templates"):
+        for name in CHART_TEMPLATES:
+            chart_templates[name] = CHART_TEMPLATES[name]()
+
+
+# C H A R T  D E P E N D E N C I E S
+
+# Each chart declares the part of the filtered trees it actually draws, as a
+# signature over the filtered rows. A chart is only rebuilt when its signature
+# differs from the one the browser already shows.
+cultivar_codes = np.asarray(raw_trees["CULTIVAR_NAME"].cat.codes)
+neighbourhood_codes = np.asarray(raw_trees["NEIGHBOURHOOD_NAME"].cat.codes)
+n_cultivars = len(raw_trees["CULTIVAR_NAME"].cat.categories) + 1
+n_neighbourhoods = len(raw_trees["NEIGHBOURHOOD_NAME"].cat.categories) + 1
+diameters = raw_trees["DIAMETER"].to_numpy()
+tree_ids = raw_trees["TREE_ID"].to_numpy()
+
+
+def signature(*arrays):
+    digest = hashlib.sha1()
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def cultivar_counts(rows):
+    return np.bincount(cultivar_codes[rows] + 1, minlength=n_cultivars)
+
+
+CHARTS = {
+    # tree count per cultivar
+    "bar": lambda rows: signature(cultivar_counts(rows)),
+    # bloom period and tree count of each cultivar present
+    "timeline": lambda rows: signature(cultivar_counts(rows)),
+    # the diameters binned as the density curve bins them, in O(n)
+    "diameter": lambda rows: signature(binned_diameters(diameters[rows])),
+    # tree count and diameter total per neighbourhood (rounded, so the sums
+    # match those of filter_cube whatever order they are added in)
+    "density": lambda rows: signature(
+        np.bincount(neighbourhood_codes[rows] + 1, minlength=n_neighbourhoods),
+        np.round(
+            np.bincount(
+                neighbourhood_codes[rows] + 1,
+                weights=diameters[rows],
+                minlength=n_neighbourhoods,
+            ),
+            2,
+        ),
+    ),
+    # every individual tree in view (main_callback passes only the trees in
+    # the viewport and adds the map's level of detail)
+    "map": lambda rows: signature(tree_ids[rows]),
+}
+
+CHART_BUILDERS = {
+    "bar": bar_plot,
+    "timeline": timeline_plot,
+    "diameter": diameter_plot,
+    "density": density_map,
+    "map": street_map,
+}
+
+
+# Without a map selection or radius, filter_cube gives the tree count and
+# diameter total of every (neighbourhood, cultivar) cell, which is all the bar
+# and density charts draw, so they skip the filtered rows altogether
+def cube_bar_plot(count, total):
+    counts = count[1:, 1:].sum(axis=0)
+    return bar_chart(pd.Series(counts, index=raw_trees["CULTIVAR_NAME"].cat.categories))
+
+
+def cube_density_map(count, total):
+    counts = count[1:, :].sum(axis=1)
+    totals = total[1:, :].sum(axis=1)
+    present = counts > 0
+    stats = pd.DataFrame(
+        {
+            "NEIGHBOURHOOD_NAME": raw_trees["NEIGHBOURHOOD_NAME"]
+            .cat.categories[present]
+            .astype(str),
+            "count": counts[present],
+            "mean_diameter": totals[present] / counts[present] * 2.54,
+        }
+    )
+    return density_chart(stats)
+
+
+CUBE_CHARTS = {
+    "bar": lambda count, total: signature(count.sum(axis=0)),
+    "density": lambda count, total: signature(
+        count.sum(axis=1), np.round(total.sum(axis=1), 2)
+    ),
+}
+
+CUBE_BUILDERS = {
+    "bar": cube_bar_plot,
+    "density": cube_density_map,
+}
+
+
+def visible_rows(rows, box):
+    """The `rows` in and around the map viewport `box`, if there is one."""
+    if box is None:
+        return rows
+    return np.intersect1d(rows, spatial_grid.in_bbox(*box), assume_unique=True)
+
+
+def build_charts(names, rows, cells=None, level=None, uirevision=None, box=None):
+    """{name: (output, seconds)} of the charts `names` for the filtered rows.
+
+    The filtered trees are taken from raw_trees once and shared by every
+    chart built from them. Charts in CUBE_BUILDERS are built from the filter
+    cube `cells` instead when given.
+    """
+    built = {}
+    filtered_trees = None
+    for name in names:
+        if cells is not None and name in CUBE_BUILDERS:
+            start = time.perf_counter()
+            output = CUBE_BUILDERS[name](*cells)
+        else:
+            if filtered_trees is None:
+                with metrics.timer("cherry_callback_stage_seconds", stage="take"):
+                    filtered_trees = raw_trees.take(rows)
+            start = time.perf_counter()
+            if name == "map":
+                # the filtered trees are indexed by their row in raw_trees
+                output = street_map(
+                    filtered_trees.loc[
+                        visible_rows(filtered_trees.index.to_numpy(), box)
+                    ],
+                    level=level,
+                    uirevision=uirevision,
+                )
+            else:
+                output = CHART_BUILDERS[name](filtered_trees)
+        built[name] = (output, time.perf_counter() - start)
+    return built
+
+
+chart_pool = None
+chart_pool_lock = threading.Lock()
+
+
+def get_chart_pool():
+    global chart_pool
+    with chart_pool_lock:
+        if chart_pool is None:
+            # Import what the builders need once, so every process inherits it
+            for module in startup.lazy_modules:
+                module.load()
+            chart_pool = ProcessPoolExecutor(
+                CHART_PROCESSES,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=init_chart_process,
+            )
+        return chart_pool
+
+
+def init_chart_process():
+    # Leave shutting down to the worker that forked this process, and
+    # reporting metrics too: build times are sent back with every chart
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGQUIT, signal.SIGUSR1):
+        signal.signal(sig, signal.SIG_DFL)
+    metrics.directory = None
+    # The worker may have been holding the metrics lock in another thread
+    # when it forked, and that thread doesn't exist here to release it
+    metrics.lock = threading.Lock()
+
+
+def start_chart_pool():
+    """Fork the chart processes now, before the worker starts any threads."""
+    if CHART_PROCESSES > 0:
+        get_chart_pool().submit(os.getpid).result()
+
+
+def build_chart_from_bits(name, bits, cells, level, uirevision, box):
+    rows = None if bits is None else to_rows(bits, len(raw_trees))
+    return build_charts([name], rows, cells, level, uirevision, box)[name]
+
+
+def run_builders(names, rows, cells=None, level=None, uirevision=None, box=None):
+    """build_charts, with one chart per pool process if CHART_PROCESSES."""
+    global chart_pool
+    if CHART_PROCESSES < 1 or len(names) < 2:
+        return build_charts(names, rows, cells, level, uirevision, box)
+
+    # Only the filtered rows are sent, as a bitset of raw_trees: every process
+    # takes the trees from its own copy-on-write view of raw_trees
+    bits = None
+    if rows is not None:
+        mask = np.zeros(len(raw_trees), dtype=bool)
+        mask[rows] = True
+        bits = to_bits(mask)
+    try:
+        pool = get_chart_pool()
+        futures = {
+            name: pool.submit(
+                build_chart_from_bits, name, bits, cells, level, uirevision, box
+            )
+            for name in names
+        }
+        return {name: future.result() for name, future in futures.items()}
+    except BrokenProcessPool:
+        # A pool process died: start a new pool for the next callback
+        with chart_pool_lock:
+            chart_pool = None
+        return build_charts(names, rows, cells, level, uirevision, box)
 
 
 # Set up callbacks/backend
 @app.callback(
-    Output("bar", "srcDoc"),
-    Output("timeline", "srcDoc"),
-    Output("diameter", "srcDoc"),
-    Output("density", "srcDoc"),
+    Output("bar", CHART_PROPERTY),
+    Output("timeline", CHART_PROPERTY),
+    Output("diameter", CHART_PROPERTY),
+    Output("density", CHART_PROPERTY),
     Output("map", "figure"),
+    Output("chart-signatures", "data"),
     Input("picker_date", "start_date"),
     Input("picker_date", "end_date"),
     Input("filter_neighbourhood", "value"),
     Input("filter_cultivar", "value"),
     Input("slider_diameter", "value"),
-    Input("map", "selectedData"),
+    Input("map-selection", "data"),
+    Input("map-view", "data"),
+    Input("filter_radius", "value"),
+    Input("map", "clickData"),
+    State("chart-signatures", "data"),
 )
 def main_callback(
-    start_date, end_date, neighbourhood, cultivar, diameter_range, selectedData
+    start_date,
+    end_date,
+    neighbourhood,
+    cultivar,
+    diameter_range,
+    map_selection,
+    map_view=None,
+    near_radius=None,
+    clickData=None,
+    shown_signatures=None,
 ):
-    # Build new dataset and call all charts
+    # Build new dataset and call the charts whose data changed
+    callback_start = time.perf_counter()
+
+    start_date, end_date = parse_dates(start_date, end_date)
+
+    # The map keeps the user's zoom until the neighbourhood selection changes,
+    # and only receives the trees in (and around) its viewport
+    revision = map_revision(neighbourhood)
+    zoom = MAP_ZOOM
+    box = None
+    if map_view and map_view.get("revision") == revision:
+        zoom = map_view["zoom"]
+        if map_view.get("bounds"):
+            box = viewport_box(map_view["bounds"], zoom)
+
+    # Trees near the clicked point, once a radius is picked
+    near = near_filter(near_radius, clickData)
+
+    def filter_rows():
+        with metrics.timer("cherry_callback_stage_seconds", stage="filter"):
+            return filter_trees(
+                start_date,
+                end_date,
+                neighbourhood,
+                cultivar,
+                diameter_range,
+                map_selection,
+                near,
+            )
 
+    # Identical filter states render identical charts (as pages, or as data
+    # for the in-page renderer)
+    cache_key = (
+        CHART_PROPERTY,
+        start_date.isoformat(),
+        end_date.isoformat(),
+        sorted(neighbourhood or []),
+        sorted(cultivar or []),
+        list(diameter_range),
+        map_selection,
+        near,
+        min(int(zoom), MAP_CLUSTER_MAX_ZOOM),
+        box,
+    )
+    with metrics.timer("cherry_callback_stage_seconds", stage="cache_get"):
+        cached = result_cache.get(cache_key)
+    cells = None
+    if cached is not MISSING:
+        signatures, outputs, level = cached
+        rows = None
+    else:
+        if not map_selection and near is None:
+            with metrics.timer("cherry_callback_stage_seconds", stage="cube"):
+                cells = filter_cube.query(
+                    neighbourhood, cultivar, diameter_range, (start_date, end_date)
+                )
+        rows = filter_rows()
+        with metrics.timer("cherry_callback_stage_seconds", stage="signatures"):
+            map_rows = visible_rows(rows, box)
+            level = map_level(len(map_rows), zoom)
+            signatures = {}
+            for name, view in CHARTS.items():
+                if cells is not None and name in CUBE_CHARTS:
+                    signatures[name] = CUBE_CHARTS[name](*cells)
+                else:
+                    signatures[name] = view(rows)
+            signatures["map"] = "%s@%s" % (CHARTS["map"](map_rows), level)
+        outputs = {}
+    # The filtered rows are computed once and shared by every chart rebuilt
+    shown_signatures = shown_signatures or {}
+    to_build = [
+        name
+        for name in CHARTS
+        if shown_signatures.get(name) != signatures[name] and name not in outputs
+    ]
+    needs_rows = any(cells is None or name not in CUBE_BUILDERS for name in to_build)
+    if needs_rows and rows is None:
+        rows = filter_rows()
+    for name, (output, seconds) in run_builders(
+        to_build, rows, cells, level, revision, box
+    ).items():
+        outputs[name] = output
+        metrics.observe("cherry_chart_build_seconds", seconds, chart=name)
+        if isinstance(output, str):
+            metrics.observe("cherry_chart_bytes", len(output), chart=name)
+
+    results = []
+    for name in CHARTS:
+        if shown_signatures.get(name) == signatures[name]:
+            outcome = "unchanged"
+            results.append(no_update)
+        else:
+            outcome = "built" if name in to_build else "cached"
+            results.append(outputs[name])
+        metrics.inc("cherry_chart_updates", chart=name, outcome=outcome)
+
+    built = bool(to_build)
+    if built or cached is MISSING:
+        with metrics.timer("cherry_callback_stage_seconds", stage="cache_set"):
+            result_cache.set(cache_key, (signatures, outputs, level))
+    metrics.observe(
+        "cherry_callback_seconds",
+        time.perf_counter() - callback_start,
+        cache="miss" if cached is MISSING else "hit",
+    )
+    return (*results, signatures)
+
+
+def parse_dates(start_date, end_date):
     # Date input Cleanup
     if start_date is None:
         start_date = "2022-01-01"
@@ -487,56 +1122,270 @@ def main_callback(
         end_date = "2022-05-30"
     start_date = pd.Timestamp(date.fromisoformat(start_date))
     end_date = pd.Timestamp(date.fromisoformat(end_date))
+    return start_date, end_date
+
+
+def filter_trees(
+    start_date,
+    end_date,
+    neighbourhood,
+    cultivar,
+    diameter_range,
+    map_selection=None,
+    near=None,
+):
+    """Rows of raw_trees matching the dashboard filters.
+
+    `near` is [radius, lat, lon] of the "near the clicked tree" filter.
+    """
+    # Neighbourhood, date, diameter and cultivar filters are answered by the
+    # precomputed bitsets in one pass, and the map selection and radius by
+    # the spatial grid
+    rows = selected_rows(map_selection)
+    if near is not None:
+        near_rows = spatial_grid.within(near[1], near[2], near[0])
+        rows = near_rows if rows is None else np.intersect1d(rows, near_rows)
+    return filter_index.query(
+        neighbourhoods=neighbourhood,
+        cultivars=cultivar,
+        diameter_range=diameter_range,
+        dates=(start_date, end_date),
+        rows=rows,
+        tree_ids=(map_selection or {}).get("tree_ids"),
+    )
+
+
+def selected_rows(map_selection):
+    """Rows inside the box or lasso selected on the street map, if any."""
+    if not map_selection:
+        return None
+    if "lasso" in map_selection:
+        return spatial_grid.in_polygon(map_selection["lasso"])
+    if "range" in map_selection:
+        (lon0, lat0), (lon1, lat1) = map_selection["range"]
+        return spatial_grid.in_bbox(lon0, lat0, lon1, lat1)
+    return None
+
+
+def near_filter(near_radius, clickData):
+    """[radius, lat, lon] around the clicked point, once a radius is picked."""
+    center = clicked_point(clickData)
+    if not near_radius or center is None:
+        return None
+    return [near_radius, *center]
+
+
+def clicked_point(clickData):
+    """(lat, lon) of the tree or cluster last clicked on the street map."""
+    if not clickData or not clickData.get("points"):
+        return None
+    point = clickData["points"][0]
+    if "lat" not in point or "lon" not in point:
+        return None
+    return float(point["lat"]), float(point["lon"])
+
+
+def facet_counts(
+    start_date,
+    end_date,
+    neighbourhood,
+    cultivar,
+    diameter_range,
+    map_selection=None,
+    near=None,
+):
+    """Trees per neighbourhood and per cultivar code matching the filters.
+
+    Each dropdown's own selection is left out of its counts, so they tell how
+    many trees picking one more value would add.
+    """
+    dates = (start_date, end_date)
+    if not map_selection and near is None:
+        by_neighbourhood = filter_cube.query(None, cultivar, diameter_range, dates)
+        by_cultivar = filter_cube.query(neighbourhood, None, diameter_range, dates)
+        if by_neighbourhood is not None and by_cultivar is not None:
+            return (
+                by_neighbourhood[0][1:, :].sum(axis=1),
+                by_cultivar[0][:, 1:].sum(axis=0),
+            )
+
+    # The map selection and radius are not in the cube, so count the rows
+    rows = filter_trees(
+        start_date, end_date, None, cultivar, diameter_range, map_selection, near
+    )
+    neighbourhood_counts = np.bincount(
+        neighbourhood_codes[rows] + 1, minlength=n_neighbourhoods
+    )[1:]
+    rows = filter_trees(
+        start_date, end_date, neighbourhood, None, diameter_range, map_selection, near
+    )
+    return neighbourhood_counts, cultivar_counts(rows)[1:]
+
+
+def facet_options(labels, counts, selected):
+    # Values without any matching tree can't be picked, unless already selected
+    selected = set(selected or [])
+    return [
+        {
+            "label": "%s (%d)" % (label, count),
+            "value": label,
+            "disabled": bool(count == 0 and label not in selected),
+        }
+        for label, count in sorted(zip(labels, counts.tolist()))
+    ]
+
+
+neighbourhood_labels = list(raw_trees["NEIGHBOURHOOD_NAME"].cat.categories)
+cultivar_labels = list(raw_trees["CULTIVAR_NAME"].cat.categories)
+
 
-    filtered_trees = raw_trees
-
-    # Filter by selection from big map
-    if selectedData is not None:
-        selectedTrees = []
-        if "points" in selectedData:
-            if selectedData["points"] is not None:
-                for point in selectedData["points"]:
-                    # print(point)
-                    selectedTrees.append(point["customdata"][-1])
-                # print(selectedTrees)
-        filtered_trees = filtered_trees[filtered_trees["TREE_ID"].isin(selectedTrees)]
-
-    # Filter by neighbourhood
-    if neighbourhood:
-        filtered_trees = filtered_trees[
-            filtered_trees["NEIGHBOURHOOD_NAME"].isin(neighbourhood)
-        ]
-
-    # Filter by date
-
-    filtered_trees = filtered_trees[
-        (
-            (filtered_trees["BLOOM_START"] <= start_date)
-            & (filtered_trees["BLOOM_END"] >= start_date)
+@app.callback(
+    Output("filter_neighbourhood", "options"),
+    Output("filter_cultivar", "options"),
+    Input("picker_date", "start_date"),
+    Input("picker_date", "end_date"),
+    Input("filter_neighbourhood", "value"),
+    Input("filter_cultivar", "value"),
+    Input("slider_diameter", "value"),
+    Input("map-selection", "data"),
+    Input("filter_radius", "value"),
+    Input("map", "clickData"),
+)
+def update_facets(
+    start_date,
+    end_date,
+    neighbourhood,
+    cultivar,
+    diameter_range,
+    map_selection,
+    near_radius=None,
+    clickData=None,
+):
+    # Live tree counts in the neighbourhood and cultivar dropdowns
+    with metrics.timer("cherry_callback_stage_seconds", stage="facets"):
+        start_date, end_date = parse_dates(start_date, end_date)
+        by_neighbourhood, by_cultivar = facet_counts(
+            start_date,
+            end_date,
+            neighbourhood,
+            cultivar,
+            diameter_range,
+            map_selection,
+            near_filter(near_radius, clickData),
         )
-        | (
-            (filtered_trees["BLOOM_START"] <= end_date)
-            & (filtered_trees["BLOOM_END"] >= end_date)
+        return (
+            facet_options(neighbourhood_labels, by_neighbourhood, neighbourhood),
+            facet_options(cultivar_labels, by_cultivar, cultivar),
         )
-        | (filtered_trees["BLOOM_START"].between(start_date, end_date))
-        | (filtered_trees["BLOOM_END"].between(start_date, end_date))
-    ]
 
-    # Filter by Diameter
-    filtered_trees = filtered_trees[
-        filtered_trees["DIAMETER"].between(diameter_range[0], diameter_range[1])
-    ]
 
-    if cultivar:
-        filtered_trees = filtered_trees[filtered_trees["CULTIVAR_NAME"].isin(cultivar)]
+# Only the selection geometry is sent to the server, not every selected point
+app.clientside_callback(
+    """
+    function(selectedData) {
+        if (!selectedData) {
+            return null;
+        }
+        if (selectedData.lassoPoints && selectedData.lassoPoints.mapbox) {
+            return {lasso: selectedData.lassoPoints.mapbox};
+        }
+        if (selectedData.range && selectedData.range.mapbox) {
+            return {range: selectedData.range.mapbox};
+        }
+        var treeIds = (selectedData.points || [])
+            .map(function(point) { return point.customdata; })
+            .filter(function(data) { return data && data[0] !== "cluster"; })
+            .map(function(data) { return data[data.length - 1]; });
+        return {tree_ids: treeIds};
+    }
+    """,
+    Output("map-selection", "data"),
+    Input("map", "selectedData"),
+)
+
 
-    bar = bar_plot(filtered_trees)
-    timeline = timeline_plot(filtered_trees)
-    diameter = diameter_plot(filtered_trees)
-    density = density_map(filtered_trees)
-    big_map = street_map(filtered_trees)
+# In-page charts: each chart is embedded once, from the spec served below, and
+# then updated in place with the datasets of every new payload
+@server.route("/charts/<name>.vl.json")
+def chart_spec(name):
+    if name not in CHART_TEMPLATES:
+        abort(404)
+    return Response(dumps(chart_template(name).spec), mimetype="application/json")
 
-    return bar, timeline, diameter, density, big_map
+
+if CHARTS_IN_PAGE:
+    for name in CHART_TEMPLATES:
+        app.clientside_callback(
+            """
+            function(payload) {
+                var no_update = window.dash_clientside.no_update;
+                if (!payload) {
+                    return no_update;
+                }
+                var chart = JSON.parse(payload);
+                var el = document.getElementById(chart.chart + "-view");
+                var views = window.cherryCharts = window.cherryCharts || {};
+                var view = views[chart.chart];
+                if (!view || view.el !== el) {
+                    view = views[chart.chart] = {el: el};
+                    view.ready = fetch(chart.spec)
+                        .then(function(response) { return response.json(); })
+                        .then(function(spec) {
+                            spec.datasets = Object.assign(
+                                {}, spec.datasets, chart.datasets
+                            );
+                            return vegaEmbed(el, spec, {mode: "vega-lite"});
+                        })
+                        .then(function(result) { return result.view; });
+                } else {
+                    view.ready = view.ready.then(function(vegaView) {
+                        Object.keys(chart.datasets).forEach(function(name) {
+                            vegaView.change(
+                                name,
+                                vega.changeset()
+                                    .remove(vega.truthy)
+                                    .insert(chart.datasets[name])
+                            );
+                        });
+                        return vegaView.runAsync();
+                    });
+                }
+                // embedded again with the next payload if anything failed
+                view.ready.catch(function(error) {
+                    if (views[chart.chart] === view) {
+                        delete views[chart.chart];
+                    }
+                    console.error(error);
+                });
+                return no_update;
+            }
+            """,
+            Output(name + "-view", "className"),
+            Input(name, "data"),
+        )
+
+
+def map_revision(neighbourhood):
+    return "|".join(sorted(neighbourhood or []))
+
+
+@app.callback(
+    Output("map-view", "data"),
+    Input("map", "relayoutData"),
+    State("filter_neighbourhood", "value"),
+)
+def update_map_view(relayoutData, neighbourhood):
+    # Only zoom/pan events change the view, not selections or resizes
+    if not relayoutData or "mapbox.zoom" not in relayoutData:
+        return no_update
+    derived = relayoutData.get("mapbox._derived") or {}
+    return {
+        "zoom": relayoutData["mapbox.zoom"],
+        "center": relayoutData.get("mapbox.center"),
+        # corners of the visible map as [[lon, lat], ...]
+        "bounds": derived.get("coordinates"),
+        "revision": map_revision(neighbourhood),
+    }
 
 
 @app.callback(
@@ -549,5 +1398,140 @@ def open_toast(n):
     return True
 
 
+# M E T R I C S
+
+# Requests whose duration and response size are recorded, by path
+TIMED_PATHS = {"/_dash-update-component", "/api/trees/near"}
+
+
+@server.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@server.after_request
+def record_request(response):
+    if request.path in TIMED_PATHS and "request_start" in g:
+        metrics.observe(
+            "cherry_http_request_seconds",
+            time.perf_counter() - g.request_start,
+            path=request.path,
+        )
+        metrics.observe(
+            "cherry_http_response_bytes",
+            response.calculate_content_length() or 0,
+            path=request.path,
+        )
+    return response
+
+
+@server.route("/metrics")
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+# A P I
+
+# Bounds on a single /api/trees/near request
+NEAR_MAX_RADIUS = 5000
+NEAR_MAX_TREES = 500
+
+
+def api_error(message):
+    return jsonify(error=message), 400
+
+
+@server.route("/api/trees/near")
+def trees_near():
+    """Trees near a point as JSON, closest first.
+
+    Query parameters: `lat` and `lon`, either `radius` (metres, at most
+    NEAR_MAX_RADIUS) or `k` (number of trees), and optionally `date`
+    (YYYY-MM-DD) to only return trees in bloom on that day. At most
+    NEAR_MAX_TREES trees are returned.
+    """
+    args = request.args
+    try:
+        lat, lon = float(args["lat"]), float(args["lon"])
+        radius = float(args["radius"]) if "radius" in args else None
+        k = int(args["k"]) if "k" in args else None
+        day = date.fromisoformat(args["date"]) if "date" in args else None
+    except KeyError as e:
+        return api_error("missing parameter %s" % e.args[0])
+    except ValueError as e:
+        return api_error(str(e))
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return api_error("lat/lon out of range")
+    if (radius is None) == (k is None):
+        return api_error("give exactly one of radius or k")
+    if radius is not None and not 0 <= radius <= NEAR_MAX_RADIUS:
+        return api_error("radius must be between 0 and %d" % NEAR_MAX_RADIUS)
+    if k is not None and k < 0:
+        return api_error("k must not be negative")
+
+    mask = None
+    if day is not None:
+        mask = np.zeros(len(raw_trees), dtype=bool)
+        mask[filter_index.query(dates=(pd.Timestamp(day), pd.Timestamp(day)))] = True
+    if radius is not None:
+        rows = spatial_grid.within(lat, lon, radius, mask)
+        rows = rows[np.argsort(spatial_grid.distances(rows, lat, lon), kind="stable")]
+    else:
+        rows = spatial_grid.nearest(lat, lon, min(k, NEAR_MAX_TREES), mask)
+    rows = rows[:NEAR_MAX_TREES]
+
+    trees = raw_trees.take(rows)
+    found = pd.DataFrame(
+        {
+            "tree_id": trees["TREE_ID"].astype("int64"),
+            "common_name": trees["COMMON_NAME"].astype(object),
+            "cultivar": trees["CULTIVAR_NAME"].astype(object),
+            "neighbourhood": trees["NEIGHBOURHOOD_NAME"].astype(object),
+            "diameter_cm": (trees["DIAMETER"].astype("float64") * 2.54).round(2),
+            "lat": trees["lat"].astype("float64"),
+            "lon": trees["lon"].astype("float64"),
+            "distance_m": spatial_grid.distances(rows, lat, lon).round(1),
+            "bloom_start": trees["BLOOM_START"].dt.strftime("%Y-%m-%d"),
+            "bloom_end": trees["BLOOM_END"].dt.strftime("%Y-%m-%d"),
+        }
+    ).astype(object)
+    found = found.where(found.notna(), None)
+    return jsonify(
+        lat=lat,
+        lon=lon,
+        radius=radius,
+        k=k,
+        date=day.isoformat() if day else None,
+        count=len(found),
+        trees=found.to_dict("records"),
+    )
+
+
+# S T A R T U P
+
+
+def prewarm():
+    """Import the deferred modules and build the default view once."""
+    with timed("prewarm", "prewarm"):
+        for module in startup.lazy_modules:
+            module.load()
+        main_callback(None, None, None, None, [0, 100], None)
+
+
+def start_prewarm():
+    # in the background, so the server answers health checks meanwhile
+    threading.Thread(target=prewarm, daemon=True).start()
+
+
+@server.route("/startup")
+def startup_report():
+    """Import and initialization time of this worker, as JSON."""
+    return jsonify(startup.report())
+
+
+startup.mark_ready()
+
 if __name__ == "__main__":
+    if PREWARM:
+        start_prewarm()
     app.run_server(debug=True)
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import stat
+import tempfile
+
+# Disk-backed result cache shared by all gunicorn workers on a node.
+#
+# Entries are pickle files named by the hash of their key, inside a namespace
+# directory named after the data snapshot, so publishing a new snapshot
+# invalidates everything cached for the old one. Reads touch the file's mtime
+# and writes evict the least recently used files once the cache grows past
+# its size budget. Writes go through a temporary file and an atomic rename,
+# so concurrent workers never see a partial entry.
+
+MISSING = object()
+
+
+def private_directory(path):
+    """`path`, created if needed, when only this user can write to it.
+
+    Entries are unpickled, so a directory someone else created or can write
+    to (e.g. planted in a shared /tmp) is never used: a fresh private one is
+    created instead.
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        info = os.lstat(path)
+        if (
+            stat.S_ISDIR(info.st_mode)
+            and info.st_uid == os.getuid()
+            and not info.st_mode & 0o077
+        ):
+            return path
+    except OSError:
+        pass
+    return tempfile.mkdtemp(prefix=os.path.basename(path) + "-")
+
+
+class ResultCache:
+    def __init__(self, directory, namespace, max_bytes=256 * 1024 * 1024):
+        self.root = directory
+        self.directory = os.path.join(directory, "snapshot-" + namespace)
+        self.max_bytes = max_bytes
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Entries for other snapshots can never be hit again
+        for other in os.listdir(self.root):
+            path = os.path.join(self.root, other)
+            if other.startswith("snapshot-") and path != self.directory:
+                shutil.rmtree(path, ignore_errors=True)
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def path(self, key):
+        digest = hashlib.sha1(
+            json.dumps(key, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return os.path.join(self.directory, digest + ".pkl")
+
+    def get(self, key):
+        """Cached value for `key`, or MISSING."""
+        if not self.enabled:
+            return MISSING
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return MISSING
+        return value
+
+    def set(self, key, value):
+        if not self.enabled:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path(key))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".pkl"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,294 @@
+import numpy as np
+import pandas as pd
+
+# Bitmap filter engine for the dashboard filters.
+#
+# Every filter value (a neighbourhood, a cultivar, a diameter bound) is
+# precomputed as a packed bitset over the rows of the trees frame, so any
+# combination of filters is answered by OR-ing the selected values of a
+# filter together and AND-ing the filters, then unpacking once into row
+# indices at the end.
+
+# Diameter buckets cover the range of the diameter slider. Each whole inch k
+# has two buckets: one for d == k and one for k < d < k + 1, which makes the
+# inclusive `between(lo, hi)` of integer bounds exact.
+MAX_DIAMETER = 150
+
+
+def to_bits(mask):
+    return np.packbits(mask)
+
+
+def to_rows(bits, n):
+    return np.flatnonzero(np.unpackbits(bits, count=n))
+
+
+def any_of(bitsets, nbytes):
+    if not bitsets:
+        return np.zeros(nbytes, dtype=np.uint8)
+    return np.bitwise_or.reduce(bitsets)
+
+
+def diameter_buckets(diameter):
+    """Diameter bucket of every tree, -1 outside [0, MAX_DIAMETER]."""
+    with np.errstate(invalid="ignore"):
+        whole = np.floor(diameter)
+        bucket = 2 * whole + (diameter != whole)
+        in_range = (diameter >= 0) & (diameter <= MAX_DIAMETER)
+    return np.where(in_range, bucket, -1).astype(np.int64)
+
+
+def bucket_range(lo, hi):
+    """Inclusive bucket range of integer diameter bounds, or None."""
+    if not (
+        float(lo).is_integer()
+        and float(hi).is_integer()
+        and 0 <= lo <= hi <= MAX_DIAMETER
+    ):
+        return None
+    return 2 * int(lo), 2 * int(hi)
+
+
+def category_bitsets(values):
+    # One bitset per category label, built from the integer codes
+    cat = pd.Categorical(values)
+    codes = np.asarray(cat.codes)
+    return {
+        label: to_bits(codes == code) for code, label in enumerate(cat.categories)
+    }
+
+
+class CultivarIntervals:
+    """Bloom period of every cultivar, indexed by cultivar code.
+
+    BLOOM_START/BLOOM_END come from data/bloom_range.csv by cultivar, so a date
+    filter only has to be evaluated once per cultivar rather than per tree.
+    """
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def from_trees(cls, trees):
+        """Build the table, or return None if dates vary within a cultivar."""
+        cat = pd.Categorical(trees["CULTIVAR_NAME"])
+        periods = pd.DataFrame(
+            {
+                "code": cat.codes,
+                "start": trees["BLOOM_START"].to_numpy(),
+                "end": trees["BLOOM_END"].to_numpy(),
+            }
+        )
+        # trees without a cultivar must not carry a bloom period of their own
+        no_cultivar = periods[periods["code"] < 0]
+        if no_cultivar[["start", "end"]].notna().any(axis=None):
+            return None
+        periods = periods[periods["code"] >= 0]
+        by_code = periods.groupby("code")[["start", "end"]]
+        if (by_code.nunique(dropna=False) > 1).any(axis=None):
+            return None
+        first = by_code.first().reindex(range(len(cat.categories)))
+        return cls(first["start"].to_numpy(), first["end"].to_numpy())
+
+    def matching(self, start, end):
+        """Boolean per cultivar code: bloom period overlaps [start, end]."""
+        start, end = np.datetime64(start, "ns"), np.datetime64(end, "ns")
+        return (self.start <= end) & (self.end >= start)
+
+
+class FilterIndex:
+    """Precomputed bitsets answering the dashboard filters for `trees`."""
+
+    def __init__(self, trees):
+        self.n = len(trees)
+        self.nbytes = (self.n + 7) // 8
+        self.all = to_bits(np.ones(self.n, dtype=bool))
+
+        self.neighbourhoods = category_bitsets(trees["NEIGHBOURHOOD_NAME"])
+
+        # cultivars are kept as a 2d array so a set of codes ORs in one reduce
+        cultivars = pd.Categorical(trees["CULTIVAR_NAME"])
+        codes = np.asarray(cultivars.codes)
+        self.cultivar_codes = {
+            label: code for code, label in enumerate(cultivars.categories)
+        }
+        self.cultivar_bits = np.zeros((len(self.cultivar_codes), self.nbytes), np.uint8)
+        for code in self.cultivar_codes.values():
+            self.cultivar_bits[code] = to_bits(codes == code)
+        self.intervals = CultivarIntervals.from_trees(trees)
+
+        tree_ids = trees["TREE_ID"].to_numpy()
+        self._id_order = np.argsort(tree_ids, kind="stable")
+        self._sorted_ids = tree_ids[self._id_order]
+
+        self.diameter = trees["DIAMETER"].to_numpy()
+        self.bloom_start = trees["BLOOM_START"].to_numpy()
+        self.bloom_end = trees["BLOOM_END"].to_numpy()
+
+        # diameter_le[b] holds the rows whose diameter bucket is <= b
+        bucket = diameter_buckets(self.diameter)
+        self.diameter_le = np.empty((2 * MAX_DIAMETER + 1, self.nbytes), np.uint8)
+        le = np.zeros(self.n, dtype=bool)
+        for b in range(2 * MAX_DIAMETER + 1):
+            le |= bucket == b
+            self.diameter_le[b] = to_bits(le)
+
+    def by_values(self, bitsets, values):
+        return any_of([bitsets[v] for v in values if v in bitsets], self.nbytes)
+
+    def by_diameter(self, lo, hi):
+        buckets = bucket_range(lo, hi)
+        if buckets is None:
+            with np.errstate(invalid="ignore"):
+                return to_bits((self.diameter >= lo) & (self.diameter <= hi))
+        first, last = buckets
+        bits = self.diameter_le[last]
+        if first > 0:
+            bits = bits & ~self.diameter_le[first - 1]
+        return bits
+
+    def by_cultivar_codes(self, allowed):
+        return any_of(list(self.cultivar_bits[allowed]), self.nbytes)
+
+    def by_dates(self, start, end):
+        # per tree fallback when bloom periods are not a function of cultivar
+        start, end = np.datetime64(start, "ns"), np.datetime64(end, "ns")
+        return to_bits((self.bloom_start <= end) & (self.bloom_end >= start))
+
+    def by_tree_ids(self, tree_ids):
+        mask = np.zeros(self.n, dtype=bool)
+        tree_ids = np.asarray(tree_ids, dtype=np.int64)
+        if self.n and len(tree_ids):
+            pos = np.searchsorted(self._sorted_ids, tree_ids).clip(max=self.n - 1)
+            found = self._sorted_ids[pos] == tree_ids
+            mask[self._id_order[pos[found]]] = True
+        return to_bits(mask)
+
+    def by_rows(self, rows):
+        mask = np.zeros(self.n, dtype=bool)
+        mask[rows] = True
+        return to_bits(mask)
+
+    def query(
+        self,
+        neighbourhoods=None,
+        cultivars=None,
+        diameter_range=None,
+        dates=None,
+        tree_ids=None,
+        rows=None,
+    ):
+        """Row indices matching all given filters; None means unfiltered."""
+        bits = self.all
+        if tree_ids is not None:
+            bits = bits & self.by_tree_ids(tree_ids)
+        if rows is not None:
+            bits = bits & self.by_rows(rows)
+        if neighbourhoods:
+            bits = bits & self.by_values(self.neighbourhoods, neighbourhoods)
+
+        # Cultivar and date filters are both resolved per cultivar and then
+        # broadcast to trees with a single OR over the allowed cultivars
+        allowed = None
+        if cultivars:
+            allowed = np.zeros(len(self.cultivar_codes), dtype=bool)
+            allowed[
+                [self.cultivar_codes[c] for c in cultivars if c in self.cultivar_codes]
+            ] = True
+        if dates is not None:
+            if self.intervals is not None:
+                in_bloom = self.intervals.matching(*dates)
+                allowed = in_bloom if allowed is None else allowed & in_bloom
+            else:
+                bits = bits & self.by_dates(*dates)
+        if allowed is not None:
+            bits = bits & self.by_cultivar_codes(allowed)
+        if diameter_range is not None:
+            bits = bits & self.by_diameter(*diameter_range)
+        return to_rows(bits, self.n)
+
+
+class FilterCube:
+    """Tree count and diameter total by neighbourhood, cultivar and diameter.
+
+    Axes 0 and 1 are neighbourhood and cultivar codes plus one, so trees
+    without one sit at index 0, and axis 2 is the diameter bucket. Both
+    arrays are cumulative along the bucket axis, so a diameter range is one
+    subtraction. Dates are resolved per cultivar with `intervals`. Without a
+    map selection, this answers the neighbourhood, cultivar, date and diameter
+    filters for per neighbourhood and per cultivar totals in O(cells),
+    whatever the number of trees.
+    """
+
+    def __init__(self, trees, intervals):
+        neighbourhoods = pd.Categorical(trees["NEIGHBOURHOOD_NAME"])
+        cultivars = pd.Categorical(trees["CULTIVAR_NAME"])
+        self.neighbourhood_codes = {
+            label: code + 1 for code, label in enumerate(neighbourhoods.categories)
+        }
+        self.cultivar_codes = {
+            label: code + 1 for code, label in enumerate(cultivars.categories)
+        }
+        self.intervals = intervals
+
+        shape = (
+            len(neighbourhoods.categories) + 1,
+            len(cultivars.categories) + 1,
+            2 * MAX_DIAMETER + 1,
+        )
+        diameter = trees["DIAMETER"].to_numpy()
+        bucket = diameter_buckets(diameter)
+        keep = bucket >= 0
+        cells = np.ravel_multi_index(
+            (
+                np.asarray(neighbourhoods.codes)[keep] + 1,
+                np.asarray(cultivars.codes)[keep] + 1,
+                bucket[keep],
+            ),
+            shape,
+        )
+        size = int(np.prod(shape))
+        count = np.bincount(cells, minlength=size).reshape(shape)
+        total = np.bincount(
+            cells, weights=diameter[keep].astype("float64"), minlength=size
+        ).reshape(shape)
+        self.count_le = np.cumsum(count, axis=2)
+        self.total_le = np.cumsum(total, axis=2)
+
+    def mask(self, codes, values):
+        mask = np.zeros(len(codes) + 1, dtype=bool)
+        mask[[codes[v] for v in values if v in codes]] = True
+        return mask
+
+    def query(
+        self, neighbourhoods=None, cultivars=None, diameter_range=None, dates=None
+    ):
+        """(count, diameter total) per (neighbourhood, cultivar) cell.
+
+        Returns None when the cube cannot answer: without a diameter range
+        of whole inches within the buckets, or with dates that are not a
+        function of the cultivar.
+        """
+        if diameter_range is None or (dates is not None and self.intervals is None):
+            return None
+        buckets = bucket_range(*diameter_range)
+        if buckets is None:
+            return None
+        first, last = buckets
+        count = self.count_le[:, :, last].copy()
+        total = self.total_le[:, :, last].copy()
+        if first > 0:
+            count -= self.count_le[:, :, first - 1]
+            total -= self.total_le[:, :, first - 1]
+
+        keep = np.ones(count.shape, dtype=bool)
+        if neighbourhoods:
+            keep &= self.mask(self.neighbourhood_codes, neighbourhoods)[:, None]
+        if cultivars:
+            keep &= self.mask(self.cultivar_codes, cultivars)[None, :]
+        if dates is not None:
+            # trees without a cultivar have no bloom period
+            in_bloom = np.concatenate([[False], self.intervals.matching(*dates)])
+            keep &= in_bloom[None, :]
+        return np.where(keep, count, 0), np.where(keep, total, 0.0)
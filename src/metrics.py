@@ -0,0 +1,172 @@
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# Lightweight in-process metrics, exposed in the Prometheus text format.
+#
+# Every gunicorn worker keeps its own counters and histograms in memory, which
+# costs a lock and a bisect per observation. A background thread in each
+# worker dumps them, every `flush_interval` while they change, to a JSON file
+# named after the worker's pid in a shared directory, so whichever worker
+# answers /metrics can report all of them, labelled by worker pid.
+
+# Histogram buckets for durations (seconds) and payload sizes (bytes)
+SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES = (1e3, 1e4, 3e4, 1e5, 3e5, 1e6, 3e6, 1e7, 3e7)
+
+
+class Registry:
+    def __init__(self, directory=None, flush_interval=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        # name -> (kind, help, buckets)
+        self.metrics = {}
+        # (name, labels) -> counter value, or histogram bucket counts + sum
+        self.values = {}
+        self.dirty = False
+        # pid of the process the flush thread runs in; a forked worker starts
+        # its own
+        self.flusher_pid = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def counter(self, name, help):
+        self.metrics[name] = ("counter", help, None)
+
+    def histogram(self, name, help, buckets=SECONDS):
+        self.metrics[name] = ("histogram", help, tuple(buckets))
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+            self.dirty = True
+        self.start_flusher()
+
+    def observe(self, name, value, **labels):
+        buckets = self.metrics[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            counts = self.values.get(key)
+            if counts is None:
+                # one count per bucket, then +Inf, then the sum
+                counts = self.values[key] = [0] * (len(buckets) + 1) + [0.0]
+            counts[bisect.bisect_left(buckets, value)] += 1
+            counts[-1] += value
+            self.dirty = True
+        self.start_flusher()
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def snapshot(self):
+        with self.lock:
+            return [
+                [name, list(labels), list(v) if isinstance(v, list) else v]
+                for (name, labels), v in self.values.items()
+            ]
+
+    def start_flusher(self):
+        if not self.directory or self.flusher_pid == os.getpid():
+            return
+        with self.lock:
+            if self.flusher_pid == os.getpid():
+                return
+            self.flusher_pid = os.getpid()
+        threading.Thread(target=self.flush_forever, daemon=True).start()
+
+    def flush_forever(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if self.dirty:
+                self.dirty = False
+                self.flush()
+
+    def flush(self):
+        path = os.path.join(self.directory, "worker-%d.json" % os.getpid())
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, path)
+
+    def worker_snapshots(self):
+        # this worker live, the others from their last flush
+        snapshots = {os.getpid(): self.snapshot()}
+        if not self.directory:
+            return snapshots
+        for entry in os.scandir(self.directory):
+            if not (entry.name.startswith("worker-") and entry.name.endswith(".json")):
+                continue
+            pid = int(entry.name[len("worker-") : -len(".json")])
+            if pid in snapshots:
+                continue
+            if not pid_alive(pid):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+                continue
+            try:
+                with open(entry.path) as f:
+                    snapshots[pid] = json.load(f)
+            except (FileNotFoundError, ValueError):
+                continue
+        return snapshots
+
+    def render(self):
+        """All workers' metrics in the Prometheus text exposition format."""
+        series = {}
+        for pid, values in sorted(self.worker_snapshots().items()):
+            for name, labels, value in values:
+                labels = [tuple(label) for label in labels] + [("worker", str(pid))]
+                series.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name, (kind, help, buckets) in self.metrics.items():
+            lines.append("# HELP %s %s" % (name, help))
+            lines.append("# TYPE %s %s" % (name, kind))
+            for labels, value in series.get(name, []):
+                if kind == "counter":
+                    lines.append("%s_total%s %s" % (name, format_labels(labels), value))
+                    continue
+                cumulative = 0
+                for le, count in zip(buckets + ("+Inf",), value[:-1]):
+                    cumulative += count
+                    lines.append(
+                        "%s_bucket%s %d"
+                        % (name, format_labels(labels + [("le", le)]), cumulative)
+                    )
+                lines.append("%s_sum%s %r" % (name, format_labels(labels), value[-1]))
+                lines.append(
+                    "%s_count%s %d" % (name, format_labels(labels), cumulative)
+                )
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{%s}" % ",".join(
+        '%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in labels
+    )
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -1,38 +1,378 @@
-import pandas as pd
+import argparse
+import hashlib
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from src.snapshot import (
+    SNAPSHOT_FORMAT,
+    SNAPSHOT_COLUMNS,
+    current_version,
+    publish_snapshot,
+    read_extra,
+    read_meta,
+    read_snapshot,
+    to_snapshot_frame,
+)
 
-# import tables
-trees = pd.read_csv("../data/raw_trees.csv", sep=";")
-bloom_range = pd.read_csv("../data/bloom_range.csv")
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+# columns of the raw export we actually use
+RAW_COLUMNS = [
+    "TREE_ID",
+    "GENUS_NAME",
+    "CULTIVAR_NAME",
+    "COMMON_NAME",
+    "NEIGHBOURHOOD_NAME",
+    "DIAMETER",
+    "Geom",
+]
+
+# Pin every raw dtype. Left to pandas, a text column is guessed per chunk and
+# one without any values comes back as float64, which breaks the bloom range
+# merge and changes the row fingerprints.
+RAW_DTYPES = {
+    "TREE_ID": "int64",
+    "GENUS_NAME": "object",
+    "CULTIVAR_NAME": "object",
+    "COMMON_NAME": "object",
+    "NEIGHBOURHOOD_NAME": "object",
+    "DIAMETER": "float64",
+    "Geom": "object",
+}
 
 # set cultivar list to drop. These are not the right tree type
 drop = ["SEIBOLDI", "SWEETHEART", "MIYAKO"]
 
-# join the two tables to add defined bloom periods
-bloom_include = pd.merge(left=trees, right=bloom_range, on="CULTIVAR_NAME", how="left")
-# drop inappropriate cultivars
-trees_upload = bloom_include[~bloom_include["CULTIVAR_NAME"].isin(drop)]
+# Bump when processing changes the rows of an unchanged export, so the next
+# --incremental run rebuilds in full (2: one row per TREE_ID)
+PROCESSING_VERSION = 2
+
+# Geom holds a GeoJSON point, e.g. {"coordinates": [-123.1, 49.2], "type": "Point"}
+COORDINATES = r'"coordinates"\s*:\s*\[\s*([-+0-9.eE]+)\s*,\s*([-+0-9.eE]+)\s*\]'
+
+
+def read_bloom_range(path):
+    bloom_range = pd.read_csv(path)
+    bloom_range["BLOOM_START"] = pd.to_datetime(
+        bloom_range["BLOOM_START"], format="%d/%m/%Y"
+    )
+    bloom_range["BLOOM_END"] = pd.to_datetime(bloom_range["BLOOM_END"], format="%d/%m/%Y")
+    return bloom_range
+
+
+def read_raw_chunks(path, chunksize):
+    header = pd.read_csv(path, sep=";", nrows=0).columns
+    columns = [c for c in RAW_COLUMNS if c in header]
+    return pd.read_csv(
+        path,
+        sep=";",
+        usecols=columns,
+        dtype={c: RAW_DTYPES[c] for c in columns},
+        chunksize=chunksize,
+    )
+
+
+def extract_coordinates(geom):
+    # One vectorized regex pass over the GeoJSON strings instead of json.loads per row
+    if geom.empty:
+        return geom.astype("float64"), geom.astype("float64")
+    coords = geom.str.extract(COORDINATES).astype("float64")
+    return coords[0], coords[1]
+
+
+def title_case(s):
+    # Title case each distinct value once rather than every row
+    titles = {v: v.title() for v in s.dropna().unique()}
+    return s.map(titles)
+
+
+def process_chunk(chunk, bloom_range, genus=None):
+    """Processed snapshot rows of a raw chunk, and the RAW_ROW each came from."""
+    if genus is not None and "GENUS_NAME" in chunk:
+        chunk = chunk[chunk["GENUS_NAME"] == genus]
+
+    # drop inappropriate cultivars
+    chunk = chunk[~chunk["CULTIVAR_NAME"].isin(drop)]
+
+    # Drop NA coordinates (to prevent issues with map)
+    chunk = chunk.dropna(subset=["Geom"])
+
+    # join the two tables to add defined bloom periods
+    chunk = pd.merge(left=chunk, right=bloom_range, on="CULTIVAR_NAME", how="left")
+
+    chunk["lon"], chunk["lat"] = extract_coordinates(chunk["Geom"])
+
+    # Convert neighbourhood to title case (to match with map geojson)
+    chunk["NEIGHBOURHOOD_NAME"] = title_case(chunk["NEIGHBOURHOOD_NAME"])
+
+    # Replace NA of CULTIVAR_NAME
+    chunk["CULTIVAR_NAME"] = title_case(chunk["CULTIVAR_NAME"].fillna("No_Cultivar"))
+    chunk["COMMON_NAME"] = title_case(chunk["COMMON_NAME"])
+
+    # keep only the compact snapshot columns so finished chunks stay small
+    return to_snapshot_frame(chunk), chunk["RAW_ROW"].to_numpy()
+
+
+def fingerprint(chunk):
+    # Content hash of each raw row, used to spot changed trees between exports.
+    # Missing values hash differently in object and float64 columns, so the
+    # dtypes are pinned for the hash not to depend on chunk boundaries.
+    chunk = chunk.astype({c: RAW_DTYPES[c] for c in chunk.columns})
+    return pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+
+
+def last_unique(ids, values):
+    # Keep the last occurrence of every id, sorted by id
+    ids_rev = ids[::-1]
+    ids_unique, first = np.unique(ids_rev, return_index=True)
+    return ids_unique, values[::-1][first]
+
+
+def object_categories(values):
+    # union_categoricals needs categories of one dtype; snapshots read back
+    # with str categories on pandas 3, freshly processed chunks have object
+    return pd.Categorical.from_codes(
+        values.codes, categories=values.categories.astype(object)
+    )
+
+
+def concat_chunks(chunks):
+    if not chunks:
+        return pd.DataFrame(
+            {col: pd.Series(dtype=kind) for col, kind in SNAPSHOT_COLUMNS.items()}
+        )
+    # Empty parts (e.g. a chunk whose trees were all reused) add no rows, and
+    # their categories may have a different dtype than the others'
+    chunks = [c for c in chunks if len(c)] or chunks[:1]
+    out = {}
+    for col, kind in SNAPSHOT_COLUMNS.items():
+        if kind == "category":
+            out[col] = union_categoricals(
+                [object_categories(c[col].array) for c in chunks]
+            )
+        else:
+            out[col] = pd.concat([c[col] for c in chunks], ignore_index=True).to_numpy()
+    return pd.DataFrame(out)
+
+
+class Previous:
+    """Fingerprints and processed rows of the last published snapshot."""
+
+    def __init__(self, path):
+        self.trees = read_snapshot(path)
+        self.ids = read_extra(path, "raw_ids")
+        self.hashes = read_extra(path, "raw_hashes")
+        self.tree_order = np.argsort(self.trees["TREE_ID"].to_numpy(), kind="stable")
+        self.tree_ids = self.trees["TREE_ID"].to_numpy()[self.tree_order]
+
+    def unchanged(self, ids, hashes):
+        # rows whose TREE_ID existed before with identical raw content
+        if len(self.ids) == 0:
+            return np.zeros(len(ids), dtype=bool)
+        pos = np.searchsorted(self.ids, ids).clip(max=len(self.ids) - 1)
+        return (self.ids[pos] == ids) & (self.hashes[pos] == hashes)
+
+    def rows_for(self, ids):
+        # previously processed rows for the given TREE_IDs (dropped trees have
+        # none), and which of the ids were found
+        if len(self.tree_ids) == 0:
+            return self.trees.iloc[:0], np.zeros(len(ids), dtype=bool)
+        pos = np.searchsorted(self.tree_ids, ids).clip(max=len(self.tree_ids) - 1)
+        found = self.tree_ids[pos] == ids
+        return self.trees.iloc[self.tree_order[pos[found]]], found
+
+
+def process_files(
+    paths, bloom_range, chunksize=50_000, workers=1, genus=None, previous=None
+):
+    """Stream raw exports chunk by chunk, optionally across a process pool.
+
+    Every TREE_ID is kept once, from its last raw row, so later files take
+    precedence when the same tree appears more than once. With `previous`,
+    raw rows whose fingerprint is unchanged are copied from the previous
+    snapshot instead of being re-parsed and re-merged.
+    Returns the processed trees and the (sorted ids, hashes) fingerprints.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    chunks, raw_rows, fp_ids, fp_hashes = [], [], [], []
+    pending = []
+    offset = 0
+
+    def finish(item):
+        reused, result = item
+        parts = [reused] if reused is not None else []
+        parts.append(result.result() if pool is not None else result)
+        frames = [frame for frame, _ in parts]
+        chunks.append(concat_chunks(frames) if len(frames) > 1 else frames[0])
+        raw_rows.append(np.concatenate([rows for _, rows in parts]))
+
+    try:
+        for path in paths:
+            for chunk in read_raw_chunks(path, chunksize):
+                ids = chunk["TREE_ID"].to_numpy()
+                hashes = fingerprint(chunk)
+                fp_ids.append(ids)
+                fp_hashes.append(hashes)
+
+                # position of every raw row across all files, to order the
+                # processed and reused rows alike
+                rows = np.arange(offset, offset + len(chunk))
+                offset += len(chunk)
+                chunk = chunk.assign(RAW_ROW=rows)
+
+                reused = None
+                if previous is not None:
+                    unchanged = previous.unchanged(ids, hashes)
+                    reused, found = previous.rows_for(ids[unchanged])
+                    reused = (reused, rows[unchanged][found])
+                    chunk = chunk[~unchanged]
+
+                if pool is not None:
+                    result = pool.submit(process_chunk, chunk, bloom_range, genus)
+                else:
+                    result = process_chunk(chunk, bloom_range, genus)
+                pending.append((reused, result))
+                # Keep at most a couple of chunks per worker in flight to bound memory
+                if len(pending) >= 2 * workers:
+                    finish(pending.pop(0))
+        for item in pending:
+            finish(item)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # In raw order, keeping the last row of every TREE_ID as the fingerprints
+    # do, so an incremental build matches a full rebuild
+    trees = concat_chunks(chunks)
+    if raw_rows:
+        trees = trees.take(np.argsort(np.concatenate(raw_rows), kind="stable"))
+    trees = trees.drop_duplicates("TREE_ID", keep="last").reset_index(drop=True)
+
+    if fp_ids:
+        fingerprints = last_unique(np.concatenate(fp_ids), np.concatenate(fp_hashes))
+    else:
+        fingerprints = (np.empty(0, "int64"), np.empty(0, "uint64"))
+    return trees, fingerprints
+
+
+def diff_fingerprints(previous, ids, hashes):
+    """Added, changed and removed TREE_IDs between two sorted fingerprint sets."""
+    if previous is None:
+        return ids, ids[:0], ids[:0]
+    common, new_pos, old_pos = np.intersect1d(
+        ids, previous.ids, assume_unique=True, return_indices=True
+    )
+    added = np.setdiff1d(ids, common, assume_unique=True)
+    removed = np.setdiff1d(previous.ids, common, assume_unique=True)
+    changed = common[hashes[new_pos] != previous.hashes[old_pos]]
+    return added, changed, removed
+
+
+def inputs_fingerprint(bloom_range_path, genus):
+    # Anything besides the raw rows that changes the processed output
+    digest = hashlib.sha1()
+    with open(bloom_range_path, "rb") as f:
+        digest.update(f.read())
+    digest.update(json.dumps([drop, genus, SNAPSHOT_FORMAT, PROCESSING_VERSION]).encode())
+    return digest.hexdigest()
+
 
-# Drop NA coordinates (to prevent issues with map)
-trees_upload = trees_upload.dropna(subset=["Geom"])
+def load_previous(store, inputs):
+    version = current_version(store)
+    if version is None:
+        return None, "no previous snapshot"
+    path = os.path.join(store, version)
+    meta = read_meta(path)
+    if meta.get("inputs") != inputs:
+        return None, "bloom ranges or processing options changed"
+    if "raw_ids" not in meta["extra"]:
+        return None, "previous snapshot has no fingerprints"
+    return Previous(path), None
 
-# extract coordinates
-def as_tuple(s):
-    return json.loads(s)["coordinates"]
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Process raw street trees into a snapshot."
+    )
+    parser.add_argument(
+        "raw",
+        nargs="*",
+        default=[os.path.join(DATA_DIR, "raw_trees.csv")],
+        help="raw street trees export(s), ';' separated",
+    )
+    parser.add_argument(
+        "--bloom-range", default=os.path.join(DATA_DIR, "bloom_range.csv")
+    )
+    parser.add_argument(
+        "--out",
+        default=os.path.join(DATA_DIR, "processed_trees"),
+        help="snapshot store to publish the new version into",
+    )
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--genus", help="only keep trees of this GENUS_NAME, e.g. PRUNUS")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only reprocess trees added or changed since the current snapshot",
+    )
+    parser.add_argument(
+        "--keep", type=int, default=5, help="number of snapshot versions to retain"
+    )
+    args = parser.parse_args(argv)
 
-def get_coord(x, pos):
-    return as_tuple(x)[pos]
+    inputs = inputs_fingerprint(args.bloom_range, args.genus)
+    previous, reason = None, "full rebuild requested"
+    if args.incremental:
+        previous, reason = load_previous(args.out, inputs)
 
+    bloom_range = read_bloom_range(args.bloom_range)
+    trees, (ids, hashes) = process_files(
+        args.raw,
+        bloom_range,
+        chunksize=args.chunksize,
+        workers=args.workers,
+        genus=args.genus,
+        previous=previous,
+    )
 
-trees_upload["lon"] = trees_upload.Geom.apply(get_coord, args=[0])
-trees_upload["lat"] = trees_upload.Geom.apply(get_coord, args=[1])
+    added, changed, removed = diff_fingerprints(previous, ids, hashes)
+    manifest = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sources": [os.path.basename(p) for p in args.raw],
+        "previous": current_version(args.out),
+        "incremental": previous is not None,
+        "full_rebuild_reason": reason if previous is None else None,
+        "added": len(added),
+        "changed": len(changed),
+        "removed": len(removed),
+    }
+    if previous is not None:
+        # Only list ids for deltas; a full rebuild would list every tree
+        manifest["added_ids"] = added.tolist()
+        manifest["changed_ids"] = changed.tolist()
+        manifest["removed_ids"] = removed.tolist()
 
-# Convert neighbourhood to title case (to match with map geojson)
-trees_upload["NEIGHBOURHOOD_NAME"] = trees_upload["NEIGHBOURHOOD_NAME"].str.title()
+    # save new data as a typed snapshot (see src/snapshot.py)
+    version = publish_snapshot(
+        args.out,
+        trees,
+        manifest,
+        extra={"raw_ids": ids, "raw_hashes": hashes},
+        info={"inputs": inputs},
+        keep=args.keep,
+    )
+    print(
+        "%s: %d trees (%d added, %d changed, %d removed)"
+        % (version, len(trees), len(added), len(changed), len(removed))
+    )
 
-# Replace NA of CULTIVAR_NAME
-trees_upload["CULTIVAR_NAME"] = trees_upload["CULTIVAR_NAME"].fillna("No_Cultivar")
 
-# save new data
-trees_upload.to_csv("../data/processed_trees.csv", index=False)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Typed columnar snapshot of the processed trees.
+#
+# A snapshot is a directory holding one .npy file per column plus a meta.json
+# describing dtypes and category labels. Columns are stored in the dtype the
+# app uses them in, so loading is a memory map rather than a parse.
+#
+# Snapshots are published into a store directory (data/processed_trees/) as
+# numbered versions, v0001/, v0002/, ..., each with a manifest.json of what
+# changed since the previous one. The CURRENT file names the live version.
+
+SNAPSHOT_FORMAT = 1
+
+# column -> storage kind
+SNAPSHOT_COLUMNS = {
+    "TREE_ID": "int32",
+    "NEIGHBOURHOOD_NAME": "category",
+    "CULTIVAR_NAME": "category",
+    "COMMON_NAME": "category",
+    "DIAMETER": "float32",
+    "lat": "float32",
+    "lon": "float32",
+    "BLOOM_START": "datetime64[ns]",
+    "BLOOM_END": "datetime64[ns]",
+}
+
+
+def to_snapshot_frame(df):
+    """Coerce a processed trees frame to the snapshot column dtypes."""
+    out = {}
+    for col, kind in SNAPSHOT_COLUMNS.items():
+        if kind == "category":
+            out[col] = pd.Categorical(df[col].astype(object))
+        else:
+            out[col] = df[col].to_numpy().astype(kind)
+    return pd.DataFrame(out, index=pd.RangeIndex(len(df)))
+
+
+def write_snapshot(df, path, extra=None, info=None):
+    """Write a processed trees frame to a snapshot directory at `path`.
+
+    `extra` maps names to additional arrays stored next to the columns (e.g.
+    raw row fingerprints), `info` is merged into meta.json.
+    """
+    df = to_snapshot_frame(df)
+    extra = extra or {}
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    meta = dict(info or {})
+    meta.update(
+        {"format": SNAPSHOT_FORMAT, "rows": len(df), "columns": {}, "extra": []}
+    )
+    for col, kind in SNAPSHOT_COLUMNS.items():
+        if kind == "category":
+            values = df[col].cat.codes.to_numpy()
+            meta["columns"][col] = {
+                "kind": kind,
+                "dtype": values.dtype.str,
+                "categories": df[col].cat.categories.tolist(),
+            }
+        else:
+            values = df[col].to_numpy()
+            meta["columns"][col] = {"kind": kind, "dtype": values.dtype.str}
+        np.save(os.path.join(tmp_path, col + ".npy"), np.ascontiguousarray(values))
+
+    for name, values in extra.items():
+        np.save(
+            os.path.join(tmp_path, "_" + name + ".npy"), np.ascontiguousarray(values)
+        )
+        meta["extra"].append(name)
+
+    with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+
+
+def read_meta(path):
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if meta["format"] != SNAPSHOT_FORMAT:
+        raise ValueError(
+            "Unsupported snapshot format %r in %s" % (meta["format"], path)
+        )
+    return meta
+
+
+def read_snapshot(path, mmap=True):
+    """Load a snapshot directory as a DataFrame without parsing any text."""
+    meta = read_meta(path)
+    mmap_mode = "r" if mmap else None
+    columns = {}
+    for col, info in meta["columns"].items():
+        values = np.load(os.path.join(path, col + ".npy"), mmap_mode=mmap_mode)
+        if info["kind"] == "category":
+            columns[col] = pd.Categorical.from_codes(
+                values, categories=info["categories"]
+            )
+        else:
+            columns[col] = values
+    return pd.DataFrame(columns, index=pd.RangeIndex(meta["rows"]), copy=False)
+
+
+def read_extra(path, name, mmap=True):
+    """Load one of the extra arrays written alongside a snapshot, or None."""
+    if name not in read_meta(path)["extra"]:
+        return None
+    return np.load(
+        os.path.join(path, "_" + name + ".npy"), mmap_mode="r" if mmap else None
+    )
+
+
+def current_version(store):
+    """Name of the live snapshot version in `store`, or None."""
+    try:
+        with open(os.path.join(store, "CURRENT")) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def publish_snapshot(store, df, manifest, extra=None, info=None, keep=5):
+    """Write `df` as the next version in `store` and make it current.
+
+    Only the newest `keep` versions are retained. Returns the version name.
+    """
+    os.makedirs(store, exist_ok=True)
+    versions = sorted(
+        v for v in os.listdir(store) if v.startswith("v") and v[1:].isdigit()
+    )
+    version = "v%04d" % (int(versions[-1][1:]) + 1 if versions else 1)
+    path = os.path.join(store, version)
+
+    info = dict(info or {}, version=version)
+    write_snapshot(df, path, extra=extra, info=info)
+    manifest = dict(manifest, version=version, rows=len(df))
+    with open(os.path.join(path, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    tmp = os.path.join(store, "CURRENT.tmp")
+    with open(tmp, "w") as f:
+        f.write(version + "\n")
+    os.replace(tmp, os.path.join(store, "CURRENT"))
+
+    for old in (versions + [version])[:-keep]:
+        shutil.rmtree(os.path.join(store, old), ignore_errors=True)
+    return version
+
+
+def read_processed_csv(path):
+    """Load the legacy processed_trees.csv and apply the app-side cleanup."""
+    df = pd.read_csv(path)
+    df["BLOOM_START"] = pd.to_datetime(df["BLOOM_START"], format="%d/%m/%Y")
+    df["BLOOM_END"] = pd.to_datetime(df["BLOOM_END"], format="%d/%m/%Y")
+    df["CULTIVAR_NAME"] = df["CULTIVAR_NAME"].str.title()
+    df["COMMON_NAME"] = df["COMMON_NAME"].str.title()
+    return to_snapshot_frame(df)
+
+
+def snapshot_path(data_dir):
+    """Path of the snapshot the app should serve, or None if there is none."""
+    store = os.path.join(data_dir, "processed_trees")
+    version = current_version(store)
+    if version is not None:
+        return os.path.join(store, version)
+    if os.path.exists(os.path.join(store, "meta.json")):
+        return store
+    return None
+
+
+def snapshot_version(data_dir):
+    """Identifier of the data the app would load, for cache invalidation.
+
+    Version labels restart at v0001 when a store is rebuilt from scratch, so
+    the identifier also hashes the snapshot's meta.json and manifest.json.
+    """
+    path = snapshot_path(data_dir)
+    store = hashlib.sha1(os.path.abspath(data_dir).encode()).hexdigest()[:8]
+    if path is None:
+        stat = os.stat(os.path.join(data_dir, "processed_trees.csv"))
+        return "%s-mtime%d-%d" % (store, stat.st_mtime_ns, stat.st_size)
+
+    digest = hashlib.sha1()
+    for name in ("meta.json", "manifest.json"):
+        try:
+            with open(os.path.join(path, name), "rb") as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            pass
+    version = read_meta(path).get("version") or "unversioned"
+    return "%s-%s-%s" % (store, version, digest.hexdigest()[:12])
+
+
+def load_trees(data_dir):
+    """Load the processed trees, preferring the snapshot over the CSV."""
+    path = snapshot_path(data_dir)
+    if path is not None:
+        return read_snapshot(path)
+    return read_processed_csv(os.path.join(data_dir, "processed_trees.csv"))
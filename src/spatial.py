@@ -0,0 +1,245 @@
+import numpy as np
+import pandas as pd
+
+# Spatial helpers for the street map.
+
+# Mapbox renders 512px tiles, so at zoom z one pixel spans this many degrees
+# of longitude
+DEGREES_PER_PIXEL = 360 / 512
+
+# Clusters are roughly this many pixels across on screen
+CLUSTER_PIXELS = 40
+
+
+def cluster_cell(level, lat):
+    """Cluster cell size in degrees (lon, lat) at an integer zoom level."""
+    lon_size = CLUSTER_PIXELS * DEGREES_PER_PIXEL / 2 ** level
+    return lon_size, lon_size * np.cos(np.radians(lat))
+
+
+def cluster_keys(lat, lon, level, lat0):
+    """Grid cell (ix, iy) of every point at a zoom level."""
+    lon_size, lat_size = cluster_cell(level, lat0)
+    return (
+        np.floor(np.asarray(lon, dtype="float64") / lon_size).astype(np.int64),
+        np.floor(np.asarray(lat, dtype="float64") / lat_size).astype(np.int64),
+    )
+
+
+def grid_clusters(lat, lon, level, lat0):
+    """Aggregate points into grid cells at a zoom level.
+
+    Returns a frame with one row per non-empty cell: its key (ix, iy), the
+    number of points and their centroid.
+    """
+    ix, iy = cluster_keys(lat, lon, level, lat0)
+    cells = pd.DataFrame(
+        {"ix": ix, "iy": iy, "lat": np.asarray(lat, "float64"), "lon": lon}
+    )
+    clusters = cells.groupby(["ix", "iy"], sort=False).agg(
+        count=("lat", "size"), lat=("lat", "mean"), lon=("lon", "mean")
+    )
+    return clusters.reset_index()
+
+
+def viewport_box(coordinates, zoom, margin=1):
+    """Box (lon0, lat0, lon1, lat1) of map data to send for a viewport.
+
+    `coordinates` are the viewport corners as [[lon, lat], ...]. The box is
+    snapped outwards to the map tiles of the zoom level and padded by `margin`
+    tiles, so small pans stay inside the same box.
+    """
+    lon = [c[0] for c in coordinates]
+    lat = [c[1] for c in coordinates]
+    lon_size = 512 * DEGREES_PER_PIXEL / 2 ** int(zoom)
+    lat_size = lon_size * np.cos(np.radians((min(lat) + max(lat)) / 2))
+    return (
+        float((np.floor(min(lon) / lon_size) - margin) * lon_size),
+        float((np.floor(min(lat) / lat_size) - margin) * lat_size),
+        float((np.ceil(max(lon) / lon_size) + margin) * lon_size),
+        float((np.ceil(max(lat) / lat_size) + margin) * lat_size),
+    )
+
+
+EARTH_RADIUS = 6371008.8
+
+
+class SpatialGrid:
+    """Uniform grid index over tree coordinates, in projected metres.
+
+    Points are projected with an equirectangular projection around the mean
+    latitude (accurate to well under a metre over a city) and bucketed into
+    square cells. Rows are stored sorted by cell, with the start of every
+    cell in `starts`, so the rows of a block of cells are contiguous slices.
+    """
+
+    def __init__(self, lat, lon, cell_size=200.0):
+        lat = np.asarray(lat, dtype="float64")
+        lon = np.asarray(lon, dtype="float64")
+        valid = np.isfinite(lat) & np.isfinite(lon)
+        self.lat0 = float(lat[valid].mean()) if valid.any() else 0.0
+        self.cos_lat0 = np.cos(np.radians(self.lat0))
+        self.cell_size = cell_size
+
+        self.lat, self.lon = lat, lon
+        self.x, self.y = self.project(lat, lon)
+        if valid.any():
+            self.x0, self.y0 = self.x[valid].min(), self.y[valid].min()
+            self.nx = int((self.x[valid].max() - self.x0) // cell_size) + 1
+            self.ny = int((self.y[valid].max() - self.y0) // cell_size) + 1
+        else:
+            self.x0 = self.y0 = 0.0
+            self.nx = self.ny = 1
+
+        rows = np.flatnonzero(valid)
+        ix, iy = self.cell_of(self.x[rows], self.y[rows])
+        cells = iy * self.nx + ix
+        order = np.argsort(cells, kind="stable")
+        self.rows = rows[order]
+        self.starts = np.searchsorted(cells[order], np.arange(self.nx * self.ny + 1))
+
+    def project(self, lat, lon):
+        lat = np.radians(np.asarray(lat, dtype="float64"))
+        lon = np.radians(np.asarray(lon, dtype="float64"))
+        return EARTH_RADIUS * lon * self.cos_lat0, EARTH_RADIUS * lat
+
+    def cell_of(self, x, y):
+        ix = np.floor((x - self.x0) / self.cell_size).astype(np.int64)
+        iy = np.floor((y - self.y0) / self.cell_size).astype(np.int64)
+        return ix, iy
+
+    def cell_range(self, x0, y0, x1, y1):
+        # inclusive cell index ranges covering a box, clipped to the grid
+        (ix0, ix1), (iy0, iy1) = self.cell_of(
+            np.array([min(x0, x1), max(x0, x1)]), np.array([min(y0, y1), max(y0, y1)])
+        )
+        return (
+            max(ix0, 0),
+            min(ix1, self.nx - 1),
+            max(iy0, 0),
+            min(iy1, self.ny - 1),
+        )
+
+    def rows_in_cells(self, ix0, ix1, iy0, iy1, cells=None):
+        """Rows in a block of cells, optionally only where `cells` is True."""
+        if ix0 > ix1 or iy0 > iy1:
+            return self.rows[:0]
+        if cells is None:
+            cells = np.ones((iy1 - iy0 + 1, ix1 - ix0 + 1), dtype=bool)
+        iy, ix = np.nonzero(cells)
+        ids = (iy + iy0) * self.nx + ix + ix0
+        start, stop = self.starts[ids], self.starts[ids + 1]
+        # concatenate the rows[start:stop] slices without a Python loop
+        lengths = stop - start
+        offsets = np.cumsum(lengths) - lengths
+        positions = np.arange(lengths.sum()) + np.repeat(start - offsets, lengths)
+        return self.rows[positions]
+
+    def in_bbox(self, lon0, lat0, lon1, lat1):
+        """Sorted rows within a lon/lat box."""
+        (x0, x1), (y0, y1) = self.project([lat0, lat1], [lon0, lon1])
+        x0, x1, y0, y1 = min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1)
+        rows = self.rows_in_cells(*self.cell_range(x0, y0, x1, y1))
+        x, y = self.x[rows], self.y[rows]
+        return np.sort(rows[(x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)])
+
+    def distances(self, rows, lat, lon):
+        """Great circle distance in metres from a point to each of `rows`."""
+        return haversine(self.lat[rows], self.lon[rows], lat, lon)
+
+    def within(self, lat, lon, radius, mask=None):
+        """Sorted rows within `radius` metres of a point.
+
+        `mask` optionally restricts the result to rows where it is True.
+        """
+        # candidates from the grid, padded for the projection error, then the
+        # exact distance
+        x, y = self.project(lat, lon)
+        pad = radius * 1.01 + 1
+        rows = self.rows_in_cells(*self.cell_range(x - pad, y - pad, x + pad, y + pad))
+        if mask is not None:
+            rows = rows[mask[rows]]
+        return np.sort(rows[self.distances(rows, lat, lon) <= radius])
+
+    def nearest(self, lat, lon, k, mask=None):
+        """Up to `k` rows nearest to a point, closest first."""
+        if k <= 0:
+            return self.rows[:0]
+        # grow the search radius until it holds k points or covers the grid
+        x, y = self.project(lat, lon)
+        corners_x = self.x0 + np.array([0, self.nx]) * self.cell_size
+        corners_y = self.y0 + np.array([0, self.ny]) * self.cell_size
+        farthest = np.hypot(
+            np.abs(corners_x - x).max(), np.abs(corners_y - y).max()
+        )
+        radius = self.cell_size
+        while True:
+            rows = self.within(lat, lon, radius, mask)
+            if len(rows) >= k or radius >= farthest:
+                break
+            radius *= 2
+        order = np.argsort(self.distances(rows, lat, lon), kind="stable")
+        return rows[order[:k]]
+
+    def in_polygon(self, lonlat):
+        """Sorted rows inside a polygon given as [[lon, lat], ...]."""
+        lonlat = np.asarray(lonlat, dtype="float64").reshape(-1, 2)
+        if len(lonlat) < 3:
+            return self.rows[:0]
+        px, py = self.project(lonlat[:, 1], lonlat[:, 0])
+        ix0, ix1, iy0, iy1 = self.cell_range(px.min(), py.min(), px.max(), py.max())
+        if ix0 > ix1 or iy0 > iy1:
+            return self.rows[:0]
+
+        # Cells the polygon boundary may pass through: sample every edge at
+        # half a cell and widen by one cell. Every other cell is entirely
+        # inside or outside the polygon, which its centre decides
+        qx, qy = np.roll(px, -1), np.roll(py, -1)
+        steps = np.ceil(np.hypot(qx - px, qy - py) / (self.cell_size / 2)).astype(int)
+        steps = np.maximum(steps, 1) + 1
+        t = np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+        t = t / np.repeat(steps - 1, steps)
+        sx = np.repeat(px, steps) + t * np.repeat(qx - px, steps)
+        sy = np.repeat(py, steps) + t * np.repeat(qy - py, steps)
+        sx, sy = self.cell_of(sx, sy)
+        boundary = np.zeros((iy1 - iy0 + 3, ix1 - ix0 + 3), dtype=bool)
+        sx = np.clip(sx - ix0 + 1, 0, ix1 - ix0 + 2)
+        sy = np.clip(sy - iy0 + 1, 0, iy1 - iy0 + 2)
+        boundary[sy, sx] = True
+        boundary = (
+            boundary[:-2, :-2] | boundary[:-2, 1:-1] | boundary[:-2, 2:]
+            | boundary[1:-1, :-2] | boundary[1:-1, 1:-1] | boundary[1:-1, 2:]
+            | boundary[2:, :-2] | boundary[2:, 1:-1] | boundary[2:, 2:]
+        )
+
+        cx = self.x0 + (np.arange(ix0, ix1 + 1) + 0.5) * self.cell_size
+        cy = self.y0 + (np.arange(iy0, iy1 + 1) + 0.5) * self.cell_size
+        cx, cy = np.meshgrid(cx, cy)
+        interior = ~boundary & points_in_polygon(cx, cy, px, py)
+
+        inside = self.rows_in_cells(ix0, ix1, iy0, iy1, interior)
+        edge = self.rows_in_cells(ix0, ix1, iy0, iy1, boundary)
+        edge = edge[points_in_polygon(self.x[edge], self.y[edge], px, py)]
+        return np.sort(np.concatenate([inside, edge]))
+
+
+def haversine(lat, lon, lat0, lon0):
+    lat, lon = np.radians(lat), np.radians(lon)
+    lat0, lon0 = np.radians(lat0), np.radians(lon0)
+    a = (
+        np.sin((lat - lat0) / 2) ** 2
+        + np.cos(lat) * np.cos(lat0) * np.sin((lon - lon0) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(a))
+
+
+def points_in_polygon(x, y, px, py):
+    """Even-odd rule point in polygon test, vectorized over the points."""
+    inside = np.zeros(np.shape(x), dtype=bool)
+    qx, qy = np.roll(px, -1), np.roll(py, -1)
+    for ax, ay, bx, by in zip(px, py, qx, qy):
+        if ay == by:
+            continue
+        crosses = (ay > y) != (by > y)
+        inside ^= crosses & (x < (bx - ax) * (y - ay) / (by - ay) + ax)
+    return inside
@@ -0,0 +1,99 @@
+import importlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Startup timing report.
+#
+# src/app.py times its imports and every initialization step with `timed`,
+# and can defer heavy imports with `lazy_import` until the code that needs
+# them first runs. `report` summarizes both for the /startup endpoint.
+
+STARTED = time.perf_counter()
+
+# [name, kind, seconds since STARTED when it began, duration]
+steps = []
+lock = threading.Lock()
+ready_at = None
+
+
+def record(name, start, kind="init"):
+    """Record a step that began at perf_counter() `start` and ends now."""
+    with lock:
+        steps.append([name, kind, start - STARTED, time.perf_counter() - start])
+
+
+@contextmanager
+def timed(name, kind="init"):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, start, kind)
+
+
+def mark_ready():
+    """Note that the app finished initializing."""
+    global ready_at
+    ready_at = time.perf_counter()
+
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access.
+
+    `on_import` is called with the module once it is imported.
+    """
+
+    def __init__(self, name, on_import=None):
+        self._name = name
+        self._on_import = on_import
+        self._module = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    with timed(self._name, "import"):
+                        module = importlib.import_module(self._name)
+                        if self._on_import is not None:
+                            self._on_import(module)
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+
+lazy_modules = []
+
+
+def lazy_import(name, on_import=None, lazy=True):
+    """Module `name`, imported now or, if `lazy`, when it is first used."""
+    module = LazyModule(name, on_import)
+    lazy_modules.append(module)
+    if not lazy:
+        module.load()
+    return module
+
+
+def report():
+    with lock:
+        recorded = [
+            {"name": name, "kind": kind, "start_s": start, "duration_s": duration}
+            for name, kind, start, duration in steps
+        ]
+    return {
+        "pid": os.getpid(),
+        "uptime_s": time.perf_counter() - STARTED,
+        "ready_s": None if ready_at is None else ready_at - STARTED,
+        "imports_s": sum(s["duration_s"] for s in recorded if s["kind"] == "import"),
+        "init_s": sum(s["duration_s"] for s in recorded if s["kind"] == "init"),
+        "steps": recorded,
+        "deferred": [m._name for m in lazy_modules if not m.loaded],
+    }
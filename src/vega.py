@@ -0,0 +1,91 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Precompiled chart pages.
+#
+# A ChartTemplate is an Altair chart whose data is left as named datasets,
+# rendered to HTML (spec validation, serialization and the page wrapper) once.
+# Rendering it for new data only encodes the data rows into that page. The
+# spec alone can also be drawn by a Vega renderer in the dashboard's page,
+# which is then only sent the data.
+
+
+def dumps(value):
+    """Compact JSON of `value`, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"), allow_nan=False)
+
+
+def records(df):
+    """The rows of `df` as JSON-ready dicts, as Altair would embed them.
+
+    Dates are ISO strings, categories strings and missing values None.
+    """
+    columns = []
+    for name in df.columns:
+        column = df[name]
+        if pd.api.types.is_datetime64_any_dtype(column):
+            values = np.datetime_as_string(column.to_numpy(), unit="s").astype(object)
+        elif isinstance(column.dtype, pd.CategoricalDtype):
+            values = column.astype(str).to_numpy(dtype=object)
+        else:
+            values = column.to_numpy(dtype=object)
+        values[pd.isna(column).to_numpy()] = None
+        if pd.api.types.is_float_dtype(column):
+            values = [None if v is None else float(v) for v in values]
+        elif pd.api.types.is_integer_dtype(column):
+            values = [None if v is None else int(v) for v in values]
+        else:
+            values = values.tolist()
+        columns.append(values)
+    names = [str(name) for name in df.columns]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+class ChartTemplate:
+    """HTML page of a chart, with its named datasets filled in per render.
+
+    `chart` reads its data from `alt.NamedData(name)` for every name in
+    `names`.
+    """
+
+    def __init__(self, chart, names):
+        # Vega-Lite spec without its datasets
+        self.spec = chart.to_dict()
+
+        markers = {name: "@@cherry:%s@@" % name for name in names}
+        html = chart.properties(
+            datasets={name: [marker] for name, marker in markers.items()}
+        ).to_html()
+
+        # Literal chunks of the page, split where each dataset goes
+        placeholders = {name: json.dumps([marker]) for name, marker in markers.items()}
+        for name, placeholder in placeholders.items():
+            if html.count(placeholder) != 1:
+                raise ValueError("dataset %r not found in the chart" % name)
+        self.names = sorted(names, key=lambda name: html.index(placeholders[name]))
+        self.parts = []
+        for name in self.names:
+            before, html = html.split(placeholders[name])
+            self.parts.append(before)
+        self.parts.append(html)
+
+    def render(self, **datasets):
+        """The chart's page for the DataFrames `datasets`, by name."""
+        chunks = [self.parts[0]]
+        for name, part in zip(self.names, self.parts[1:]):
+            chunks.append(dumps(records(datasets[name])))
+            chunks.append(part)
+        return "".join(chunks)
+
+    def data(self, **datasets):
+        """The spec's datasets for the DataFrames `datasets`, by name."""
+        return {name: records(datasets[name]) for name in self.names}
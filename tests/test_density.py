@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from src.density import bandwidth, diameter_counts, diameter_density
+
+# Most diameters are the same, so the interquartile range is 0. Expected
+# values from Vega 5.27.0 (src/assets/vega/vega.min.js):
+#   vega.bandwidthNRD(SAMPLE) and vega.randomKDE(SAMPLE, bw).pdf(x)
+SAMPLE = np.array([10, 20, 20, 20, 20, 20, 20, 20, 30, 45], dtype="float64")
+VEGA_BANDWIDTH = 6.156083963002742
+VEGA_PDF = {
+    10: 0.018639497601413417,
+    20: 0.04882944676338898,
+    25: 0.037643697379986886,
+    30: 0.018972450311376253,
+}
+
+
+def test_bandwidth_with_zero_iqr():
+    assert bandwidth(SAMPLE) == pytest.approx(VEGA_BANDWIDTH, rel=1e-12)
+
+
+def test_bandwidth_fallbacks():
+    # single value: no deviation, so the first quartile, then 1
+    assert bandwidth(np.array([40.0])) == pytest.approx(1.06 * 40)
+    assert bandwidth(np.array([0.0, 0.0])) == pytest.approx(1.06 * 2 ** -0.2)
+
+
+def test_density_matches_vega():
+    grid, density = diameter_density(diameter_counts(SAMPLE))
+    assert grid[0] == 9.5 and grid[-1] == 45.5
+    for x, expected in VEGA_PDF.items():
+        assert density[grid == x][0] == pytest.approx(expected, rel=1e-3)
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.filters import CultivarIntervals, FilterCube, FilterIndex, bucket_range
+
+BLOOM = {
+    "Akebono": ("2022-03-20", "2022-04-10"),
+    "Kwanzan": ("2022-04-20", "2022-05-10"),
+    "Shirotae": ("2022-04-01", "2022-04-20"),
+}
+# on and between whole and half inch bucket edges, and outside the slider
+DIAMETERS = [0, 0.25, 0.5, 1, 1.5, 2.99, 3, 10, 10.5, 24.1, 149.5, 150, 151, -1]
+
+
+def make_trees(n=601, seed=0):
+    rng = np.random.default_rng(seed)
+    cultivar = rng.choice(list(BLOOM) + ["No_Cultivar"], n)
+    start = pd.to_datetime([BLOOM.get(c, (None, None))[0] for c in cultivar])
+    end = pd.to_datetime([BLOOM.get(c, (None, None))[1] for c in cultivar])
+    return pd.DataFrame(
+        {
+            "TREE_ID": rng.permutation(n).astype("int32"),
+            "NEIGHBOURHOOD_NAME": pd.Categorical(
+                rng.choice(["Kitsilano", "Oakridge", "Sunset", None], n)
+            ),
+            "CULTIVAR_NAME": pd.Categorical(cultivar),
+            "DIAMETER": rng.choice(DIAMETERS, n).astype("float32"),
+            "BLOOM_START": start,
+            "BLOOM_END": end,
+        }
+    )
+
+
+def pandas_filter(trees, neighbourhoods, cultivars, diameter_range, dates):
+    # the dashboard's original predicate, one pandas clause per filter
+    keep = pd.Series(True, index=trees.index)
+    if neighbourhoods:
+        keep &= trees["NEIGHBOURHOOD_NAME"].isin(neighbourhoods)
+    if dates is not None:
+        start, end = (pd.Timestamp(d) for d in dates)
+        keep &= (
+            ((trees["BLOOM_START"] <= start) & (trees["BLOOM_END"] >= start))
+            | ((trees["BLOOM_START"] <= end) & (trees["BLOOM_END"] >= end))
+            | trees["BLOOM_START"].between(start, end)
+            | trees["BLOOM_END"].between(start, end)
+        )
+    if diameter_range is not None:
+        keep &= trees["DIAMETER"].between(*diameter_range)
+    if cultivars:
+        keep &= trees["CULTIVAR_NAME"].isin(cultivars)
+    return np.flatnonzero(keep.to_numpy())
+
+
+FILTERS = [
+    (None, None, [0, 150], ("2022-01-01", "2022-12-31")),
+    (["Kitsilano"], None, [0, 150], ("2022-04-15", "2022-04-15")),
+    (None, ["Kwanzan", "Akebono"], [1, 10], ("2022-04-05", "2022-04-25")),
+    (["Oakridge", "Sunset"], ["Shirotae"], [3, 3], ("2022-03-01", "2022-04-01")),
+    (None, None, [0.5, 2.99], ("2022-03-01", "2022-06-01")),
+    (None, None, [0.25, 149.5], ("2022-03-01", "2022-06-01")),
+    (None, None, [0, 150], ("2022-06-01", "2022-07-01")),
+    (["Nowhere"], None, [0, 150], ("2022-01-01", "2022-12-31")),
+    (None, ["Unknown"], [0, 150], ("2022-01-01", "2022-12-31")),
+    (None, None, [20, 5], ("2022-01-01", "2022-12-31")),
+]
+
+
+@pytest.mark.parametrize("neighbourhoods, cultivars, diameter_range, dates", FILTERS)
+def test_index_matches_pandas(neighbourhoods, cultivars, diameter_range, dates):
+    trees = make_trees()
+    index = FilterIndex(trees)
+    rows = index.query(
+        neighbourhoods=neighbourhoods,
+        cultivars=cultivars,
+        diameter_range=diameter_range,
+        dates=tuple(pd.Timestamp(d) for d in dates),
+    )
+    expected = pandas_filter(trees, neighbourhoods, cultivars, diameter_range, dates)
+    assert rows.tolist() == expected.tolist()
+
+
+def test_index_selections():
+    trees = make_trees()
+    index = FilterIndex(trees)
+    assert index.query(tree_ids=[]).tolist() == []
+    assert index.query(rows=np.array([], dtype=np.int64)).tolist() == []
+    assert index.query(neighbourhoods=[], cultivars=[]).tolist() == list(
+        range(len(trees))
+    )
+    wanted = trees["TREE_ID"].to_numpy()[[5, 3, 40]].tolist() + [10_000]
+    assert index.query(tree_ids=wanted).tolist() == [3, 5, 40]
+
+
+@pytest.mark.parametrize("neighbourhoods, cultivars, diameter_range, dates", FILTERS)
+def test_cube_matches_pandas(neighbourhoods, cultivars, diameter_range, dates):
+    trees = make_trees()
+    index = FilterIndex(trees)
+    cube = FilterCube(trees, index.intervals)
+    dates = tuple(pd.Timestamp(d) for d in dates)
+    cells = cube.query(neighbourhoods, cultivars, diameter_range, dates)
+    if bucket_range(*diameter_range) is None:
+        # fractional or inverted bounds don't map to buckets: the rows answer
+        assert cells is None
+        return
+    count, total = cells
+
+    rows = pandas_filter(trees, neighbourhoods, cultivars, diameter_range, dates)
+    filtered = trees.iloc[rows]
+    n_codes = np.asarray(filtered["NEIGHBOURHOOD_NAME"].cat.codes) + 1
+    c_codes = np.asarray(filtered["CULTIVAR_NAME"].cat.codes) + 1
+    expected_count = np.zeros(count.shape, dtype=np.int64)
+    expected_total = np.zeros(total.shape)
+    np.add.at(expected_count, (n_codes, c_codes), 1)
+    np.add.at(
+        expected_total, (n_codes, c_codes), filtered["DIAMETER"].astype("float64")
+    )
+    assert count.tolist() == expected_count.tolist()
+    assert total == pytest.approx(expected_total)
+
+
+def varying_dates(trees):
+    # one Kwanzan tree blooms at another time than the others
+    trees = trees.copy()
+    first = np.flatnonzero(trees["CULTIVAR_NAME"] == "Kwanzan")[0]
+    trees.loc[first, "BLOOM_START"] = pd.Timestamp("2022-06-01")
+    trees.loc[first, "BLOOM_END"] = pd.Timestamp("2022-06-30")
+    return trees
+
+
+def test_dates_varying_within_a_cultivar():
+    trees = varying_dates(make_trees())
+    assert CultivarIntervals.from_trees(trees) is None
+
+    index = FilterIndex(trees)
+    for neighbourhoods, cultivars, diameter_range, dates in FILTERS:
+        rows = index.query(
+            neighbourhoods=neighbourhoods,
+            cultivars=cultivars,
+            diameter_range=diameter_range,
+            dates=tuple(pd.Timestamp(d) for d in dates),
+        )
+        expected = pandas_filter(
+            trees, neighbourhoods, cultivars, diameter_range, dates
+        )
+        assert rows.tolist() == expected.tolist()
+
+    # the cube can only answer dates resolved per cultivar
+    cube = FilterCube(trees, index.intervals)
+    dates = (pd.Timestamp("2022-04-01"), pd.Timestamp("2022-04-30"))
+    assert cube.query(None, None, [0, 150], dates) is None
+    assert cube.query(None, None, [0, 150]) is not None
+
+
+def test_no_cultivar_with_bloom_period():
+    trees = make_trees()
+    first = np.flatnonzero(trees["CULTIVAR_NAME"] == "No_Cultivar")[0]
+    trees.loc[first, "CULTIVAR_NAME"] = np.nan
+    trees.loc[first, "BLOOM_START"] = pd.Timestamp("2022-04-01")
+    assert CultivarIntervals.from_trees(trees) is None
@@ -0,0 +1,92 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.process_data import main, process_files, read_bloom_range
+from src.snapshot import current_version, read_snapshot
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+HEADER = "TREE_ID;GENUS_NAME;CULTIVAR_NAME;COMMON_NAME;NEIGHBOURHOOD_NAME;DIAMETER;Geom"
+GEOM = '"{""coordinates"": [-123.1, 49.2], ""type"": ""Point""}"'
+
+
+def write_raw(tmp_path, rows):
+    path = tmp_path / "raw.csv"
+    path.write_text("\n".join([HEADER] + rows) + "\n")
+    return str(path)
+
+
+def test_chunk_without_cultivars(tmp_path):
+    # A chunk whose CULTIVAR_NAME is entirely empty must still merge on it
+    raw = write_raw(
+        tmp_path,
+        [
+            "1;PRUNUS;KWANZAN;KWANZAN FLOWERING CHERRY;KITSILANO;10.0;" + GEOM,
+            "2;PRUNUS;;CHERRY;OAKRIDGE;12.5;" + GEOM,
+        ],
+    )
+    bloom_range = read_bloom_range(os.path.join(DATA_DIR, "bloom_range.csv"))
+    trees, _ = process_files([raw], bloom_range, chunksize=1)
+    assert trees["TREE_ID"].tolist() == [1, 2]
+    assert trees["CULTIVAR_NAME"].astype(str).tolist() == ["Kwanzan", "No_Cultivar"]
+
+
+def test_fingerprints_independent_of_chunksize(tmp_path):
+    # A missing value must hash the same whichever chunk the tree lands in
+    raw = write_raw(
+        tmp_path,
+        [
+            "1;PRUNUS;;CHERRY;;10.0;" + GEOM,
+            "2;PRUNUS;KWANZAN;KWANZAN FLOWERING CHERRY;KITSILANO;12.5;" + GEOM,
+        ],
+    )
+    bloom_range = read_bloom_range(os.path.join(DATA_DIR, "bloom_range.csv"))
+    _, (ids_one, hashes_one) = process_files([raw], bloom_range, chunksize=1)
+    _, (ids_all, hashes_all) = process_files([raw], bloom_range, chunksize=2)
+    assert ids_one.tolist() == ids_all.tolist()
+    assert hashes_one.tolist() == hashes_all.tolist()
+
+
+def test_incremental_with_unchanged_chunk(tmp_path):
+    # Every tree of a chunk is reused from the previous snapshot
+    raw = write_raw(
+        tmp_path,
+        [
+            "1;PRUNUS;KWANZAN;KWANZAN FLOWERING CHERRY;KITSILANO;10.0;" + GEOM,
+            "2;PRUNUS;;CHERRY;OAKRIDGE;12.5;" + GEOM,
+        ],
+    )
+    store = str(tmp_path / "processed_trees")
+    bloom_range = os.path.join(DATA_DIR, "bloom_range.csv")
+    main([raw, "--bloom-range", bloom_range, "--out", store])
+    main([raw, "--bloom-range", bloom_range, "--out", store, "--incremental"])
+    trees = read_snapshot(os.path.join(store, current_version(store)))
+    assert trees["TREE_ID"].tolist() == [1, 2]
+
+
+def test_incremental_matches_full_rebuild_for_duplicate_ids(tmp_path):
+    rows = [
+        "1;PRUNUS;KWANZAN;KWANZAN FLOWERING CHERRY;KITSILANO;7.7;" + GEOM,
+        "2;PRUNUS;;CHERRY;OAKRIDGE;12.5;" + GEOM,
+        "1;PRUNUS;KWANZAN;KWANZAN FLOWERING CHERRY;KITSILANO;19.5;" + GEOM,
+    ]
+    bloom_range = os.path.join(DATA_DIR, "bloom_range.csv")
+    incremental = str(tmp_path / "incremental")
+    raw = write_raw(tmp_path, rows)
+    main([raw, "--bloom-range", bloom_range, "--out", incremental])
+
+    # edit the last row of the duplicated tree
+    rows[2] = rows[2].replace(";19.5;", ";30.3;")
+    raw = write_raw(tmp_path, rows)
+    args = [raw, "--bloom-range", bloom_range, "--chunksize", "2"]
+    main(args + ["--out", incremental, "--incremental"])
+    full = str(tmp_path / "full")
+    main(args + ["--out", full])
+
+    built = read_snapshot(os.path.join(incremental, current_version(incremental)))
+    expected = read_snapshot(os.path.join(full, current_version(full)))
+    assert built["TREE_ID"].tolist() == [2, 1]
+    assert built["DIAMETER"].tolist() == pytest.approx([12.5, 30.3])
+    pd.testing.assert_frame_equal(built, expected)
@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+
+from src.spatial import EARTH_RADIUS, SpatialGrid, haversine, points_in_polygon
+
+LAT0, LON0 = 49.25, -123.1
+CELL = 200.0
+
+
+def make_points(seed=0):
+    """Lattice every half cell, so points lie on cell edges, plus random ones.
+
+    The lattice is symmetric around LAT0 and sets the grid's extent, so the
+    grid's origin is a lattice corner and every other lattice line is a cell
+    edge.
+    """
+    half_lat = np.degrees(CELL / 2 / EARTH_RADIUS)
+    half_lon = half_lat / np.cos(np.radians(LAT0))
+    steps = np.arange(-8, 9)
+    lat, lon = np.meshgrid(LAT0 + steps * half_lat, LON0 + steps * half_lon)
+    lat, lon = lat.ravel(), lon.ravel()
+
+    rng = np.random.default_rng(seed)
+    extra_lat = LAT0 + rng.uniform(-7, 7, 400) * half_lat
+    extra_lon = LON0 + rng.uniform(-7, 7, 400) * half_lon
+    # mirrored, so the mean latitude stays LAT0
+    lat = np.concatenate([lat, extra_lat, 2 * LAT0 - extra_lat, [np.nan, 49.2]])
+    lon = np.concatenate([lon, extra_lon, extra_lon, [-123.1, np.nan]])
+    return lat, lon
+
+
+@pytest.fixture(scope="module")
+def grid():
+    lat, lon = make_points()
+    return SpatialGrid(lat, lon, cell_size=CELL)
+
+
+def brute_distances(grid, lat, lon):
+    return haversine(grid.lat, grid.lon, lat, lon)
+
+
+@pytest.mark.parametrize(
+    "lat, lon", [(LAT0, LON0), (49.2551, -123.109), (49.24, -123.08), (49.3, -123.0)]
+)
+@pytest.mark.parametrize("radius", [0, 50, 100, 333.3, 1000, 5000])
+def test_within_matches_haversine(grid, lat, lon, radius):
+    expected = np.flatnonzero(brute_distances(grid, lat, lon) <= radius)
+    assert grid.within(lat, lon, radius).tolist() == expected.tolist()
+
+
+def test_within_radius_through_points(grid):
+    # the radius of a point's own distance includes it
+    lat, lon = 49.2551, -123.109
+    distances = brute_distances(grid, lat, lon)
+    for row in [0, 100, 300, 700]:
+        rows = grid.within(lat, lon, distances[row])
+        assert row in rows
+        assert rows.tolist() == np.flatnonzero(distances <= distances[row]).tolist()
+
+
+def test_within_mask(grid):
+    mask = np.zeros(len(grid.lat), dtype=bool)
+    mask[::3] = True
+    distances = brute_distances(grid, LAT0, LON0)
+    expected = np.flatnonzero((distances <= 800) & mask)
+    assert grid.within(LAT0, LON0, 800, mask).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("k", [0, 1, 5, 17, 100, 10_000])
+@pytest.mark.parametrize("lat, lon", [(LAT0, LON0), (49.24, -123.08), (49.4, -122.9)])
+def test_nearest_matches_haversine(grid, lat, lon, k):
+    distances = brute_distances(grid, lat, lon)
+    valid = np.flatnonzero(np.isfinite(distances))
+    expected = valid[np.argsort(distances[valid], kind="stable")][:k]
+    rows = grid.nearest(lat, lon, k)
+    assert len(rows) == min(k, len(valid))
+    # ties may come in any order, the distances may not
+    assert distances[rows].tolist() == distances[expected].tolist()
+
+
+def test_nearest_mask(grid):
+    mask = np.zeros(len(grid.lat), dtype=bool)
+    mask[[3, 50, 600]] = True
+    rows = grid.nearest(LAT0, LON0, 10, mask)
+    assert sorted(rows.tolist()) == [3, 50, 600]
+
+
+def test_in_bbox_matches_brute_force(grid):
+    lat, lon = grid.lat, grid.lon
+    # corners on lattice points, so points lie on the box edges too
+    for a, b in [(0, 288), (20, 150), (145, 145), (288, 0)]:
+        lon0, lat0, lon1, lat1 = lon[a], lat[a], lon[b], lat[b]
+        with np.errstate(invalid="ignore"):
+            inside = (
+                (lon >= min(lon0, lon1))
+                & (lon <= max(lon0, lon1))
+                & (lat >= min(lat0, lat1))
+                & (lat <= max(lat0, lat1))
+            )
+        assert grid.in_bbox(lon0, lat0, lon1, lat1).tolist() == (
+            np.flatnonzero(inside).tolist()
+        )
+    assert grid.in_bbox(-122.0, 49.0, -121.9, 49.1).tolist() == []
+
+
+POLYGONS = {
+    "square": [
+        [-123.11, 49.245],
+        [-123.09, 49.245],
+        [-123.09, 49.255],
+        [-123.11, 49.255],
+    ],
+    "triangle": [[-123.12, 49.24], [-123.08, 49.243], [-123.1, 49.26]],
+    # self-intersecting, and a star whose middle the even-odd rule leaves out
+    "bowtie": [
+        [-123.11, 49.24],
+        [-123.09, 49.26],
+        [-123.09, 49.24],
+        [-123.11, 49.26],
+    ],
+    "star": [
+        [-123.1, 49.262],
+        [-123.089, 49.238],
+        [-123.116, 49.255],
+        [-123.084, 49.255],
+        [-123.111, 49.238],
+    ],
+    "thin": [[-123.12, 49.2499], [-123.08, 49.2501], [-123.08, 49.2502]],
+    "outside": [[-122.0, 49.0], [-121.9, 49.0], [-121.9, 49.1]],
+}
+
+
+@pytest.mark.parametrize("name", sorted(POLYGONS))
+def test_in_polygon_matches_points_in_polygon(grid, name):
+    polygon = np.asarray(POLYGONS[name])
+    px, py = grid.project(polygon[:, 1], polygon[:, 0])
+    expected = np.flatnonzero(points_in_polygon(grid.x, grid.y, px, py))
+    assert grid.in_polygon(polygon).tolist() == expected.tolist()
+
+
+def test_in_polygon_through_lattice_points(grid):
+    # vertices on points that lie on cell edges
+    rows = [20, 40, 250, 230]
+    polygon = np.column_stack([grid.lon[rows], grid.lat[rows]])
+    px, py = grid.project(polygon[:, 1], polygon[:, 0])
+    expected = np.flatnonzero(points_in_polygon(grid.x, grid.y, px, py))
+    assert grid.in_polygon(polygon).tolist() == expected.tolist()
+    assert grid.in_polygon(polygon[:2]).tolist() == []